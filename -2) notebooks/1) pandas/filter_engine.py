@@ -0,0 +1,229 @@
+# Bitmap-index filter engine
+# filtering_data.ipynb / filtering_with_pandas.ipynb build a fresh boolean mask
+# for every filter, e.g.  df[(df['Gender'] == 'female') & (df['MathScore'] > 70)]
+# When the same columns are filtered thousands of times it is cheaper to:
+#   1. build one bitmap per category value (Gender=female, LunchType=standard, ...)
+#      and one per numeric bucket (MathScore 70-79, 80-89, ...) - once
+#   2. answer AND / OR / NOT with bit operations on those bitmaps
+#   3. remember recent answers in an LRU cache
+#
+# Bitmaps are plain Python ints (bit i = row i), so & | ~ are single C calls.
+#
+#   engine = FilterEngine(df)
+#   q = and_(eq("Gender", "female"), between("MathScore", 70, 100))
+#   engine.filter(q)   -> matching rows
+#   engine.count(q)    -> number of matching rows
+
+import os
+import time
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "..", "-1) datasets",
+                    "Expanded_data_with_more_features.csv")
+
+CATEGORICAL = ["Gender", "EthnicGroup", "ParentEduc", "LunchType", "TestPrep",
+               "ParentMaritalStatus", "PracticeSport", "IsFirstChild",
+               "TransportMeans", "WklyStudyHours"]
+NUMERIC = {"MathScore": 10, "ReadingScore": 10, "WritingScore": 10, "NrSiblings": 1}
+
+
+# ---------- query building (tuples, so they can be cache keys) ----------
+
+def eq(column, value):
+    return ("eq", column, value)
+
+
+def isin(column, values):
+    return ("in", column, tuple(values))
+
+
+def between(column, low, high):
+    # inclusive on both ends, like Series.between()
+    return ("between", column, low, high)
+
+
+def and_(*parts):
+    return ("and",) + parts
+
+
+def or_(*parts):
+    return ("or",) + parts
+
+
+def not_(part):
+    return ("not", part)
+
+
+# ---------- bitmap helpers ----------
+
+def mask_to_bitmap(mask):
+    packed = np.packbits(np.asarray(mask, dtype=bool), bitorder="little")
+    return int.from_bytes(packed.tobytes(), "little")
+
+
+def bitmap_to_rows(bitmap, n_rows):
+    raw = bitmap.to_bytes((n_rows + 7) // 8, "little")
+    bits = np.unpackbits(np.frombuffer(raw, dtype=np.uint8), bitorder="little")
+    return np.flatnonzero(bits[:n_rows])
+
+
+class FilterEngine:
+    def __init__(self, df, categorical=CATEGORICAL, numeric=NUMERIC, cache_size=1024):
+        self.df = df
+        self.n_rows = len(df)
+        self.all_rows = (1 << self.n_rows) - 1
+        self.values = {}   # numeric column -> numpy array
+        self.widths = dict(numeric)
+        self.buckets = {}  # numeric column -> sorted bucket numbers that have rows
+        self.index = {}    # (column, value) or (column, "bucket", bucket) -> bitmap
+
+        for col in categorical:
+            if col not in df:
+                continue
+            codes, uniques = pd.factorize(df[col])  # NaN -> code -1
+            for code, value in enumerate(list(uniques) + [None]):
+                mask = codes == (code if value is not None else -1)
+                if mask.any():
+                    self.index[(col, value)] = mask_to_bitmap(mask)
+
+        for col, width in self.widths.items():
+            if col not in df:
+                continue
+            values = df[col].to_numpy()
+            self.values[col] = values
+            buckets = np.floor_divide(values, width)
+            missing = np.isnan(buckets) if buckets.dtype.kind == "f" else np.zeros(len(buckets), dtype=bool)
+            if missing.any():
+                self.index[(col, "bucket", None)] = mask_to_bitmap(missing)
+            self.buckets[col] = []
+            for b in np.unique(buckets[~missing]):
+                self.index[(col, "bucket", int(b))] = mask_to_bitmap(buckets == b)
+                self.buckets[col].append(int(b))
+
+        # each engine gets its own cache; cache_info() shows hits / misses
+        self._cached = lru_cache(maxsize=cache_size)(self._evaluate)
+
+    def bitmap(self, query):
+        return self._cached(query)
+
+    def count(self, query):
+        return self.bitmap(query).bit_count()
+
+    def rows(self, query):
+        return bitmap_to_rows(self.bitmap(query), self.n_rows)
+
+    def filter(self, query):
+        return self.df.iloc[self.rows(query)]
+
+    def cache_info(self):
+        return self._cached.cache_info()
+
+    def _evaluate(self, query):
+        op = query[0]
+        if op == "eq":
+            _, col, value = query
+            if value is not None and pd.isna(value):
+                value = None
+            if col in self.values:
+                # numeric columns only have bucket bitmaps: check the one bucket
+                if value is None:
+                    return self.index.get((col, "bucket", None), 0)
+                return self._between(col, value, value)
+            return self.index.get((col, value), 0)
+        if op == "in":
+            _, col, values = query
+            result = 0
+            for v in values:
+                result |= self.bitmap(eq(col, v))
+            return result
+        if op == "between":
+            return self._between(*query[1:])
+        if op == "and":
+            result = self.all_rows
+            for part in query[1:]:
+                result &= self.bitmap(part)
+                if not result:
+                    break
+            return result
+        if op == "or":
+            result = 0
+            for part in query[1:]:
+                result |= self.bitmap(part)
+            return result
+        if op == "not":
+            return self.all_rows & ~self.bitmap(query[1])
+        raise ValueError(f"unknown filter operation: {op!r}")
+
+    def _between(self, col, low, high):
+        # low / high may be -inf / inf for an open-ended filter (">= 70")
+        if pd.isna(low) or pd.isna(high) or low > high or low == np.inf or high == -np.inf:
+            return 0
+        width = self.widths[col]
+        first = low // width if low != -np.inf else None
+        last = high // width if high != np.inf else None
+        # only the buckets that hold rows, clipped to [first, last]
+        buckets = self.buckets[col]
+        start = 0 if first is None else bisect_left(buckets, first)
+        stop = len(buckets) if last is None else bisect_right(buckets, last)
+        result = 0
+        for b in buckets[start:stop]:
+            bitmap = self.index[(col, "bucket", b)]
+            if b != first and b != last:
+                # a middle bucket [b*width, (b+1)*width) lies entirely inside [low, high]
+                result |= bitmap
+            else:
+                # first / last bucket: check the real values of just these rows
+                rows = bitmap_to_rows(bitmap, self.n_rows)
+                values = self.values[col][rows]
+                keep = rows[(values >= low) & (values <= high)]
+                mask = np.zeros(self.n_rows, dtype=bool)
+                mask[keep] = True
+                result |= mask_to_bitmap(mask)
+        return result
+
+
+if __name__ == "__main__":
+    df = pd.read_csv(DATA, index_col=0)
+
+    start = time.perf_counter()
+    engine = FilterEngine(df)
+    print(f"index built in {time.perf_counter() - start:.3f}s, {len(engine.index)} bitmaps")
+
+    queries = []
+    for gender in ["male", "female"]:
+        for lunch in ["standard", "free/reduced"]:
+            for prep in ["none", "completed"]:
+                for low in range(0, 100, 5):
+                    queries.append((gender, lunch, prep, low))
+
+    start = time.perf_counter()
+    for _ in range(3):
+        for g, l, p, low in queries:
+            mask = ((df["Gender"] == g) & (df["LunchType"] == l)
+                    & (df["TestPrep"] == p) & (df["MathScore"] >= low))
+            int(mask.sum())
+    t_pandas = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(3):
+        for g, l, p, low in queries:
+            q = and_(eq("Gender", g), eq("LunchType", l), eq("TestPrep", p), between("MathScore", low, 100))
+            engine.count(q)
+    t_bitmap = time.perf_counter() - start
+
+    g, l, p, low = queries[-1]
+    expected = ((df["Gender"] == g) & (df["LunchType"] == l)
+                & (df["TestPrep"] == p) & (df["MathScore"] >= low)).sum()
+    assert engine.count(and_(eq("Gender", g), eq("LunchType", l), eq("TestPrep", p),
+                             between("MathScore", low, 100))) == expected
+    # open-ended and far-out bounds only touch the buckets that exist
+    assert engine.count(between("MathScore", 70, float("inf"))) == (df["MathScore"] >= 70).sum()
+    assert engine.count(between("MathScore", 70, 10**8)) == (df["MathScore"] >= 70).sum()
+    assert engine.count(between("MathScore", -np.inf, 69.5)) == (df["MathScore"] <= 69.5).sum()
+
+    print(f"{3 * len(queries)} filters  pandas masks: {t_pandas:.3f}s  bitmaps: {t_bitmap:.3f}s")
+    print(engine.cache_info())
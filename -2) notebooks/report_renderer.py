@@ -0,0 +1,188 @@
+# Cached chart renderer for the matplotlib / seaborn task notebooks
+# The notebooks redo the same work on every run, e.g.
+#     embark_fares = df.groupby('embark_town')['fare'].mean().reset_index()
+#     sns.barplot(x='embark_town', y='fare', data=embark_fares)
+# Here a chart is described by a small dict ("plot spec") and:
+#   - the aggregated plot input is cached, keyed by data hash + spec
+#   - the rendered PNG/SVG is cached too, so an unchanged chart is just a file lookup
+#   - charts that still need drawing are rendered in a process pool
+#   - drawing uses a bare matplotlib Figure, never pyplot, so rendering in the
+#     caller's process (one stale chart) leaves its backend and figures alone
+#   - matplotlib / seaborn are only imported inside the workers, when needed
+#
+#   specs = [{"name": "fare_by_town", "kind": "bar", "x": "embark_town", "y": "fare", "agg": "mean"}]
+#   ReportRenderer("report_cache").render(df, specs)
+
+import hashlib
+import json
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+DATASETS = os.path.join(os.path.dirname(__file__), "..", "-1) datasets")
+
+
+def data_hash(data):
+    # DataFrame -> hash of its contents, path -> hash of the file bytes
+    h = hashlib.sha1()
+    if isinstance(data, pd.DataFrame):
+        h.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+        h.update(repr(list(data.columns)).encode())
+    else:
+        with open(data, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+    return h.hexdigest()
+
+
+def spec_key(digest, spec, fields):
+    part = {k: spec.get(k) for k in fields}
+    return hashlib.sha1((digest + json.dumps(part, sort_keys=True, default=str)).encode()).hexdigest()
+
+
+def aggregate(df, spec):
+    # reduce the frame to just what the chart needs (usually a few rows)
+    kind, x, y = spec["kind"], spec.get("x"), spec.get("y")
+    if kind == "bar":
+        return df.groupby(x)[y].agg(spec.get("agg", "mean")).reset_index()
+    if kind == "count":
+        return df[x].value_counts().sort_index().rename_axis(x).reset_index(name="count")
+    if kind == "hist":
+        counts, edges = np.histogram(df[x].dropna(), bins=spec.get("bins", 20))
+        return {"counts": counts, "edges": edges}
+    if kind == "box":
+        return {k: g.dropna().to_numpy() for k, g in df.groupby(x)[y]}
+    if kind in ("line", "scatter"):
+        return df[[x, y]].dropna()
+    raise ValueError(f"unknown plot kind: {spec['kind']!r}")
+
+
+def draw(spec, data, path):
+    # runs inside a worker process, or in the caller's for a single chart
+    from matplotlib.figure import Figure
+
+    colors = None
+    if spec.get("palette"):
+        import seaborn as sns  # only charts that ask for a palette pay for seaborn
+        n = len(data) if isinstance(data, (pd.DataFrame, dict)) else 1
+        colors = sns.color_palette(spec["palette"], n)
+
+    fig = Figure(figsize=spec.get("figsize", (6, 4)))
+    ax = fig.subplots()
+    kind, x, y = spec["kind"], spec.get("x"), spec.get("y")
+    if kind == "bar":
+        ax.bar(data[x].astype(str), data[y], color=colors)
+    elif kind == "count":
+        ax.bar(data[x].astype(str), data["count"], color=colors)
+    elif kind == "hist":
+        ax.stairs(data["counts"], data["edges"], fill=True, color=colors[0] if colors else None)
+    elif kind == "box":
+        ax.boxplot(list(data.values()), tick_labels=[str(k) for k in data])
+    elif kind == "line":
+        ax.plot(data[x], data[y], marker="o")
+    elif kind == "scatter":
+        ax.scatter(data[x], data[y], s=8)
+    ax.set_title(spec.get("title", spec["name"]))
+    ax.set_xlabel(spec.get("xlabel", x or ""))
+    ax.set_ylabel(spec.get("ylabel", y or ("count" if kind in ("count", "hist") else "")))
+    fig.tight_layout()
+    _write(path, lambda f: fig.savefig(f, format=spec.get("format", "png")))
+    return path
+
+
+def _write(path, save):
+    # save(file) into a temp file next to `path`, then rename: a crash mid-write
+    # never leaves a truncated file that later runs would take as a cache hit
+    tmp = f"{path}.{os.getpid()}.tmp"  # per process: two workers may draw the same chart
+    try:
+        with open(tmp, "wb") as f:
+            save(f)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class ReportRenderer:
+    def __init__(self, cache_dir="report_cache", workers=None):
+        self.cache_dir = cache_dir
+        self.workers = workers
+        os.makedirs(os.path.join(cache_dir, "agg"), exist_ok=True)
+        os.makedirs(os.path.join(cache_dir, "fig"), exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._pool = None  # started on first use and kept, so workers import matplotlib once
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _aggregated(self, df, digest, spec):
+        key = spec_key(digest, spec, ("kind", "x", "y", "agg", "bins"))
+        path = os.path.join(self.cache_dir, "agg", key + ".pkl")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        data = aggregate(df, spec)
+        _write(path, lambda f: pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL))
+        return data
+
+    def render(self, data, specs):
+        # data: DataFrame or CSV path. Returns {spec name: image path}
+        digest = data_hash(data)
+        df = None
+        outputs, todo = {}, []
+        for spec in specs:
+            fmt = spec.get("format", "png")
+            key = spec_key(digest, spec, sorted(spec))
+            path = os.path.join(self.cache_dir, "fig", f"{key}.{fmt}")
+            outputs[spec["name"]] = path
+            if os.path.exists(path):
+                self.hits += 1
+                continue
+            self.misses += 1
+            if df is None:
+                df = data if isinstance(data, pd.DataFrame) else pd.read_csv(data)
+            todo.append((spec, self._aggregated(df, digest, spec), path))
+
+        if len(todo) == 1 or self.workers == 1:
+            for spec, agg, path in todo:
+                draw(spec, agg, path)
+        elif todo:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            list(self._pool.map(draw, *zip(*todo)))
+        return outputs
+
+
+if __name__ == "__main__":
+    students = pd.read_csv(os.path.join(DATASETS, "Expanded_data_with_more_features.csv"), index_col=0)
+    specs = [
+        {"name": "math_by_gender", "kind": "bar", "x": "Gender", "y": "MathScore", "agg": "mean",
+         "palette": "magma", "title": "Average Math Score by Gender"},
+        {"name": "lunch_count", "kind": "count", "x": "LunchType", "title": "Lunch Type Count"},
+        {"name": "reading_hist", "kind": "hist", "x": "ReadingScore", "bins": 30},
+        {"name": "math_by_prep", "kind": "box", "x": "TestPrep", "y": "MathScore"},
+        {"name": "read_vs_write", "kind": "scatter", "x": "ReadingScore", "y": "WritingScore", "format": "svg"},
+    ]
+    # one report per slice, like the nightly job
+    slices = {g: students[students["EthnicGroup"] == g] for g in students["EthnicGroup"].dropna().unique()}
+    with ReportRenderer(os.path.join(os.path.dirname(__file__), "report_cache")) as renderer:
+        for run in ("cold", "warm"):
+            start = time.perf_counter()
+            for name, part in slices.items():
+                renderer.render(part, specs)
+            print(f"{run}: {len(slices) * len(specs)} charts in {time.perf_counter() - start:.2f}s "
+                  f"(cache hits {renderer.hits}, misses {renderer.misses})")
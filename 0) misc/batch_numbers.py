@@ -0,0 +1,142 @@
+# Batch mode for add_numbers.py / conditions.py / odd_eve.py / factorial.py
+# Instead of int(input()) one number at a time, read numbers (one per line)
+# from files or stdin in big blocks, parse them with NumPy and classify the
+# whole block at once.
+#
+#   python batch_numbers.py numbers.txt > results.csv
+#   seq -5 5 | python batch_numbers.py
+#
+# Bad lines (like "abc" - remember input() always gives a string, see input.py)
+# are reported on stderr and skipped, they do not stop the run.
+
+import argparse
+import sys
+
+import numpy as np
+
+import classify as cls
+
+BLOCK_SIZE = 1 << 20  # 1 MiB per read
+# longest line looked at as a number; longer ones are invalid without being parsed
+# (NumPy byte arrays are fixed width, one huge line would make every row that wide)
+MAX_LINE = 64
+INT64_MAX = b"9223372036854775807"
+INT64_MIN = b"9223372036854775808"  # digits of -2**63
+
+# 20! is the biggest factorial that fits in int64
+FACTORIALS = np.cumprod(np.r_[1, np.arange(1, 21)]).astype(np.int64)
+
+
+def read_blocks(stream, block_size=BLOCK_SIZE):
+    # yield lists of complete lines, carrying a partial last line to the next block
+    rest = b""
+    while True:
+        chunk = stream.read(block_size)
+        if not chunk:
+            break
+        lines = (rest + chunk).split(b"\n")
+        rest = lines.pop()
+        yield lines
+    if rest:
+        yield [rest]
+
+
+def parse_block(lines):
+    # returns (numbers, index of valid lines, index of invalid lines)
+    short = np.fromiter((len(line) <= MAX_LINE for line in lines), bool, len(lines))
+    candidates = np.flatnonzero(short)
+    raw = np.char.strip(np.array([lines[i] for i in candidates], dtype=bytes).reshape(-1))
+    digits = np.char.lstrip(raw, b"+-")
+    n_signs = np.char.str_len(raw) - np.char.str_len(digits)
+    ok = np.char.isdigit(digits) & (n_signs <= 1)
+    # int64 range: up to 18 significant digits always fit, 19 digits are compared
+    # with the limit as strings (same length, so string order = number order)
+    significant = np.char.lstrip(digits, b"0")
+    length = np.char.str_len(significant)
+    negative = np.char.startswith(raw, b"-")
+    limit = np.where(negative, INT64_MIN, INT64_MAX)
+    ok &= (length < 19) | ((length == 19) & (significant <= limit))
+
+    valid = np.zeros(len(lines), dtype=bool)
+    valid[candidates] = ok
+    blank = np.zeros(len(lines), dtype=bool)
+    blank[candidates] = np.char.str_len(raw) == 0
+    invalid = ~valid & ~blank
+    numbers = raw[ok].astype(np.int64)
+    return numbers, np.flatnonzero(valid), np.flatnonzero(invalid)
+
+
+def classify(numbers):
+    sign, parity = cls.labels(numbers)
+    fact = np.full(numbers.shape, -1, dtype=np.int64)  # -1 = not defined / too big
+    small = (numbers >= 0) & (numbers <= 20)
+    fact[small] = FACTORIALS[numbers[small]]
+    return sign, parity, fact
+
+
+def exact_sum(numbers):
+    # split into high/low 32 bits so the block sum can't overflow int64
+    hi = int((numbers >> 32).sum())
+    lo = int((numbers & 0xFFFFFFFF).sum())
+    return (hi << 32) + lo
+
+
+def run(streams, out, err, block_size=BLOCK_SIZE):
+    totals = {"count": 0, "sum": 0, "invalid": 0,
+              "Positive": 0, "Negative": 0, "Zero": 0, "Even": 0, "Odd": 0}
+    out.write("number,sign,parity,factorial\n")
+
+    for name, stream in streams:
+        line_no = 0
+        for lines in read_blocks(stream, block_size):
+            numbers, _, bad = parse_block(lines)
+            for i in bad:
+                text = lines[i].strip()
+                shown = repr(text[:40]) + (f"... ({len(text)} bytes)" if len(text) > 40 else "")
+                err.write(f"{name}:{line_no + i + 1}: invalid number {shown}\n")
+            line_no += len(lines)
+
+            sign, parity, fact = classify(numbers)
+            fact_text = np.where(fact >= 0, fact.astype(str), "")
+            # plain lists are much faster to join than numpy scalars
+            rows = zip(map(str, numbers.tolist()), sign.tolist(), parity.tolist(), fact_text.tolist())
+            out.write("\n".join(map(",".join, rows)))  # one write per block
+            if len(numbers):
+                out.write("\n")
+
+            totals["count"] += len(numbers)
+            totals["sum"] += exact_sum(numbers)
+            totals["invalid"] += len(bad)
+            for label, c in cls.counts(numbers).items():
+                totals[label] += c
+    return totals
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Classify numbers in bulk")
+    parser.add_argument("files", nargs="*", help="input files (default: stdin)")
+    parser.add_argument("-o", "--output", help="write results here (default: stdout)")
+    parser.add_argument("--block-size", type=int, default=BLOCK_SIZE)
+    args = parser.parse_args(argv)
+
+    if args.files:
+        streams = [(f, open(f, "rb")) for f in args.files]
+    else:
+        streams = [("<stdin>", sys.stdin.buffer)]
+    out = open(args.output, "w") if args.output else sys.stdout
+
+    try:
+        totals = run(streams, out, sys.stderr, args.block_size)
+    finally:
+        for name, s in streams:
+            if s is not sys.stdin.buffer:
+                s.close()
+        if out is not sys.stdout:
+            out.close()
+
+    print("Summary:", totals, file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+# Shared odd/even + positive/negative/zero classifier
+# (the logic from odd_eve.py and conditions.py, for whole arrays of numbers)
+#
+# Every number gets one small code, computed for the whole array in one pass:
+#   code = (sign + 1) * 2 + (number & 1)
+#   0 Negative/Even  1 Negative/Odd  2 Zero/Even  4 Positive/Even  5 Positive/Odd
+# Parity uses a bit test (n & 1) instead of n % 2 - for two's complement ints
+# the lowest bit is 1 exactly for odd numbers, negative ones included.
+#
+#   python classify.py --bench 1000000     compare with the per-number if/elif
+#   python classify.py numbers.npy         classify a huge .npy file via memmap
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+SIGN = np.array(["Negative", "Zero", "Positive"])
+PARITY = np.array(["Even", "Odd"])
+CHUNK = 1 << 22  # numbers per chunk when reading memory-mapped files
+
+
+def sign_of(numbers):
+    # -1, 0 or 1 as int8
+    numbers = np.asarray(numbers)
+    return (numbers > 0).astype(np.int8) - (numbers < 0).astype(np.int8)
+
+
+def codes(numbers):
+    numbers = np.asarray(numbers)
+    return ((sign_of(numbers) + 1) * 2 + (numbers & 1)).astype(np.uint8)
+
+
+def labels(numbers):
+    # -> (sign labels, parity labels) as string arrays
+    numbers = np.asarray(numbers)
+    return SIGN[sign_of(numbers) + 1], PARITY[numbers & 1]
+
+
+def label(n):
+    # single number (odd_eve.py, conditions.py): plain Python ints, so any size works
+    sign = "Positive" if n > 0 else "Negative" if n < 0 else "Zero"
+    return sign, "Odd" if n & 1 else "Even"
+
+
+def summarize(code_counts):
+    # bincount of codes -> counts per label
+    c = code_counts
+    return {
+        "Negative": int(c[0] + c[1]),
+        "Zero": int(c[2] + c[3]),
+        "Positive": int(c[4] + c[5]),
+        "Even": int(c[0] + c[2] + c[4]),
+        "Odd": int(c[1] + c[3] + c[5]),
+    }
+
+
+def counts(numbers):
+    return summarize(np.bincount(codes(numbers), minlength=6))
+
+
+def open_array(path, dtype=np.int64):
+    # .npy files keep their own header; anything else is read as raw `dtype`
+    if str(path).endswith(".npy"):
+        return np.load(path, mmap_mode="r")
+    return np.memmap(path, dtype=dtype, mode="r")
+
+
+def classify_file(path, dtype=np.int64, out=None, chunk=CHUNK):
+    # works on arrays much bigger than RAM: only one chunk is in memory at a time
+    data = open_array(path, dtype)
+    result = None
+    if out is not None:
+        result = np.lib.format.open_memmap(out, mode="w+", dtype=np.uint8, shape=data.shape)
+    total = np.zeros(6, dtype=np.int64)
+    for start in range(0, len(data), chunk):
+        c = codes(data[start:start + chunk])
+        total += np.bincount(c, minlength=6)
+        if result is not None:
+            result[start:start + chunk] = c
+    if result is not None:
+        result.flush()
+    return summarize(total)
+
+
+# ---------- benchmark ----------
+
+def branching(numbers):
+    # what odd_eve.py + conditions.py do, one number at a time
+    result = {"Negative": 0, "Zero": 0, "Positive": 0, "Even": 0, "Odd": 0}
+    for num in numbers:
+        if num > 0:
+            result["Positive"] += 1
+        elif num < 0:
+            result["Negative"] += 1
+        else:
+            result["Zero"] += 1
+        if num % 2 == 0:
+            result["Even"] += 1
+        else:
+            result["Odd"] += 1
+    return result
+
+
+def bench(n, repeat=3):
+    rng = np.random.default_rng(0)
+    numbers = rng.integers(-10**9, 10**9, size=n)
+    as_list = numbers.tolist()
+
+    def best(func, arg):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            out = func(arg)
+            times.append(time.perf_counter() - start)
+        return min(times), out
+
+    t_loop, r_loop = best(branching, as_list)
+    t_vec, r_vec = best(counts, numbers)
+    assert r_loop == r_vec
+    print(f"n={n:,}")
+    print(f"  per-number if/elif : {t_loop:.4f}s")
+    print(f"  vectorized         : {t_vec:.4f}s  ({t_loop / t_vec:.0f}x faster)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Odd/even and sign classifier")
+    parser.add_argument("path", nargs="?", help=".npy or raw binary file of integers")
+    parser.add_argument("--dtype", default="int64", help="dtype of raw binary files")
+    parser.add_argument("--out", help="save per-number codes to this .npy file")
+    parser.add_argument("--bench", type=int, metavar="N", help="run the benchmark with N numbers")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        bench(args.bench)
+    elif args.path:
+        print(classify_file(args.path, np.dtype(args.dtype), args.out))
+    else:
+        parser.print_help()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,7 @@
+from classify import label
+
 num = int(input("Enter a number: "))
 
-if num > 0:
-    print("Positive")
-elif num < 0:
-    print("Negative")
-else:
-    print("Zero")
+# Positive / Negative / Zero - same rules as the old if/elif chain, see classify.py
+sign, parity = label(num)
+print(sign)
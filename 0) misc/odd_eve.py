@@ -1,6 +1,7 @@
+from classify import label
+
 num = int(input("Enter a number: "))
 
-if num % 2 == 0:
-    print(num, "is Even")
-else:
-    print(num, "is Odd")
+# parity check lives in classify.py (num & 1 instead of num % 2)
+sign, parity = label(num)
+print(num, "is", parity)
@@ -0,0 +1,162 @@
+# Cooperative loop runner (a friendlier version of `while True:`)
+# - every task runs on its own interval instead of spinning the CPU
+# - output goes through a bounded queue + rate limit so stdout is never flooded
+# - Ctrl+C / SIGTERM stops everything cleanly
+# - a task that raises is counted and logged, and keeps its schedule
+# - metrics() shows iteration latency and CPU usage
+
+import asyncio
+import signal
+import sys
+import time
+
+
+class LoopRunner:
+    def __init__(self, max_lines_per_sec=10, queue_size=100, out=sys.stdout):
+        self.tasks = []  # (name, func, interval)
+        self.max_lines_per_sec = max_lines_per_sec
+        self.queue_size = queue_size
+        self.out = out
+        self.stats = {}  # name -> {"runs", "errors", "last_error", "total_latency", "max_latency"}
+        self.dropped = 0
+        self._queue = None
+        self._stop = None
+
+    def every(self, interval, name=None):
+        # decorator: @runner.every(1.0)
+        def register(func):
+            self.add_task(func, interval, name)
+            return func
+        return register
+
+    def add_task(self, func, interval, name=None):
+        name = name or func.__name__
+        self.tasks.append((name, func, interval))
+        self.stats[name] = {"runs": 0, "errors": 0, "last_error": None,
+                            "total_latency": 0.0, "max_latency": 0.0}
+
+    async def emit(self, line):
+        # waits when the queue is full (backpressure) instead of growing forever
+        await self._queue.put(line)
+
+    def emit_nowait(self, line):
+        # for callers that must not block: drop the line when the queue is full
+        try:
+            self._queue.put_nowait(line)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def _run_task(self, name, func, interval):
+        next_run = time.monotonic()
+        while not self._stop.is_set():
+            s = self.stats[name]
+            start = time.perf_counter()
+            try:
+                result = func()
+                if asyncio.iscoroutine(result):
+                    result = await result
+            except Exception as e:
+                # one bad poll shouldn't end the task: count it and try again next slot
+                result = None
+                s["errors"] += 1
+                s["last_error"] = repr(e)
+                self.emit_nowait(f"[{name}] failed: {e!r}")
+            if result is not None:
+                await self.emit(str(result))
+            latency = time.perf_counter() - start
+
+            s["runs"] += 1
+            s["total_latency"] += latency
+            s["max_latency"] = max(s["max_latency"], latency)
+
+            # sleep until the next slot (skip slots we already missed)
+            next_run += interval
+            now = time.monotonic()
+            if next_run < now:
+                next_run = now
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=next_run - now)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _writer(self):
+        # simple rate limit: one line at a time, at most max_lines_per_sec of them
+        gap = 1.0 / self.max_lines_per_sec
+        while True:
+            line = await self._queue.get()
+            if line is None:
+                break
+            self.out.write(line + "\n")
+            self.out.flush()
+            await asyncio.sleep(gap)
+
+    def stop(self):
+        if self._stop is not None:
+            self._stop.set()
+
+    async def run(self, duration=None):
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                pass  # e.g. Windows, or not in the main thread
+
+        self._cpu_start = time.process_time()
+        self._wall_start = time.perf_counter()
+        writer = asyncio.create_task(self._writer())
+        workers = [asyncio.create_task(self._run_task(*t)) for t in self.tasks]
+        if duration is not None:
+            loop.call_later(duration, self.stop)
+
+        # a writer that dies (e.g. closed stdout) stops the runner instead of
+        # leaving the tasks blocked on a full queue
+        writer.add_done_callback(lambda _: self.stop())
+        try:
+            await self._stop.wait()
+            if writer.done():
+                for w in workers:
+                    w.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        finally:
+            self._stop.set()
+            for w in workers:
+                w.cancel()  # no-op for the ones that already finished
+            if not writer.done():
+                await self._queue.put(None)  # let the writer drain what is left
+            await writer
+        self._cpu_end = time.process_time()
+        self._wall_end = time.perf_counter()
+
+    def metrics(self):
+        wall = self._wall_end - self._wall_start
+        cpu = self._cpu_end - self._cpu_start
+        tasks = {}
+        for name, s in self.stats.items():
+            avg = s["total_latency"] / s["runs"] if s["runs"] else 0.0
+            tasks[name] = {"runs": s["runs"], "errors": s["errors"], "last_error": s["last_error"],
+                           "avg_latency": avg, "max_latency": s["max_latency"]}
+        return {
+            "wall_time": wall,
+            "cpu_time": cpu,
+            "cpu_percent": 100.0 * cpu / wall if wall else 0.0,
+            "dropped_lines": self.dropped,
+            "tasks": tasks,
+        }
+
+
+if __name__ == "__main__":
+    runner = LoopRunner(max_lines_per_sec=5)
+
+    @runner.every(1.0)
+    def hi():
+        return "hi"
+
+    @runner.every(2.0)
+    def hi2():
+        return "hi2"
+
+    asyncio.run(runner.run(duration=5))
+    print(runner.metrics())
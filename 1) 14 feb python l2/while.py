@@ -1,3 +1,21 @@
-while True:
-    print("hi")
-    print("hi2")
\ No newline at end of file
+# while True:
+#     print("hi")
+#     print("hi2")
+# ❌ the loop above never sleeps: it pins one CPU core at 100% and floods the terminal
+
+# ✅ same output, but on a timer (see loop_runner.py) - idle CPU is ~0%
+import asyncio
+from loop_runner import LoopRunner
+
+runner = LoopRunner(max_lines_per_sec=10)
+
+@runner.every(1.0)
+def hi():
+    return "hi"
+
+@runner.every(1.0)
+def hi2():
+    return "hi2"
+
+asyncio.run(runner.run())  # stop with Ctrl+C
+print(runner.metrics())
@@ -1,166 +1,7 @@
-def greet():
-    print("hello sitanshu")
+from dispatcher import send
 
+def greet(times=1):
+    # one buffered write instead of one print() per greeting
+    send("hello sitanshu", repeat=times)
 
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
\ No newline at end of file
+greet(162)
@@ -0,0 +1,145 @@
+# Batched message dispatch
+# Calling print() once per message spends most of the time in I/O calls.
+# Here we render every message into one buffer and write it in a single call.
+
+import asyncio
+import io
+import sys
+import time
+
+
+def render(template, recipients=None, repeat=1):
+    # template uses str.format fields, e.g. "hello {name}"
+    buf = io.StringIO()
+    if recipients is None:
+        line = template + "\n"
+        buf.write(line * repeat)
+    else:
+        for r in recipients:
+            fields = r if isinstance(r, dict) else {"name": r}
+            for _ in range(repeat):
+                buf.write(template.format(**fields))
+                buf.write("\n")
+    return buf.getvalue()
+
+
+def send(template, recipients=None, repeat=1, out=None):
+    out = out or sys.stdout
+    text = render(template, recipients, repeat)
+    out.write(text)  # one write, one flush
+    out.flush()
+    return text.count("\n")
+
+
+# ---------- async sinks ----------
+
+class FileSink:
+    def __init__(self, path):
+        self.path = path
+
+    async def write(self, text):
+        # file I/O is blocking, so hand it to a worker thread
+        await asyncio.to_thread(self._append, text)
+
+    def _append(self, text):
+        with open(self.path, "a") as f:
+            f.write(text)
+
+    async def close(self):
+        pass
+
+
+class SocketSink:
+    # stand-in for a network socket: keeps every "packet" it receives
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.packets = []
+
+    async def write(self, text):
+        await asyncio.sleep(self.latency)  # pretend round trip
+        self.packets.append(text.encode())
+
+    async def close(self):
+        pass
+
+
+class AsyncDispatcher:
+    # collects messages and flushes them to the sink when either
+    # max_batch messages are waiting or `window` seconds have passed
+    def __init__(self, sink, max_batch=500, window=0.05):
+        self.sink = sink
+        self.max_batch = max_batch
+        self.window = window
+        self.pending = []
+        self.sent = 0
+        self.flushes = 0
+        self._start = None
+        self._timer = None
+        self._lock = asyncio.Lock()
+
+    async def submit(self, message):
+        if self._start is None:
+            self._start = time.perf_counter()
+        self.pending.append(message)
+        if len(self.pending) >= self.max_batch:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def submit_many(self, template, recipients=None, repeat=1):
+        for line in render(template, recipients, repeat).splitlines():
+            await self.submit(line)
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.window)
+        self._timer = None
+        await self.flush()
+
+    async def flush(self):
+        async with self._lock:
+            if not self.pending:
+                return
+            batch, self.pending = self.pending, []
+            await self.sink.write("\n".join(batch) + "\n")
+            self.sent += len(batch)
+            self.flushes += 1
+
+    async def close(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self.flush()
+        await self.sink.close()
+
+    def stats(self):
+        elapsed = time.perf_counter() - self._start if self._start else 0.0
+        return {
+            "messages": self.sent,
+            "flushes": self.flushes,
+            "seconds": elapsed,
+            "messages_per_sec": self.sent / elapsed if elapsed else 0.0,
+        }
+
+
+if __name__ == "__main__":
+    # one print() per message vs one buffered write
+    n = 100_000
+    sink = io.StringIO()
+
+    start = time.perf_counter()
+    for _ in range(n):
+        print("hello sitanshu", file=sink, flush=True)
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    send("hello sitanshu", repeat=n, out=io.StringIO())
+    batch_time = time.perf_counter() - start
+    print(f"print loop: {n / loop_time:,.0f} msg/s, batched: {n / batch_time:,.0f} msg/s")
+
+    async def demo():
+        d = AsyncDispatcher(SocketSink(latency=0.001), max_batch=1000)
+        await d.submit_many("hello {name}", ["sitanshu", "saurabh"], repeat=5000)
+        await d.close()
+        print("async socket sink:", d.stats())
+
+    asyncio.run(demo())
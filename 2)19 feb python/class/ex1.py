@@ -1,9 +1,6 @@
-def greet():
-    print("Hello saurabh")
+from dispatcher import send
 
-greet()
-greet()
-greet()
-greet()
-greet()
-greet()
\ No newline at end of file
+def greet(times=1):
+    send("Hello saurabh", repeat=times)
+
+greet(6)
@@ -0,0 +1,142 @@
+# Elementwise max for big inputs
+# max_of_two() (max_2_num.py) and maxi() (odd_even.py) compare two numbers with an if.
+# Looping them over two arrays with millions of values is slow, so:
+#   maximum(a, b)        scalars -> plain compare, sequences/arrays -> numpy.maximum,
+#                        iterators -> stream_maximum, memmaps/huge arrays -> chunked_maximum
+#   stream_maximum(a, b) two (maybe endless) iterators, handled chunk by chunk
+#   chunked_maximum(a, b) memory-mapped or very large arrays, one chunk at a time
+#   TopK / running_max   largest values seen so far, O(k) memory
+
+import heapq
+import itertools
+import time
+from collections.abc import Iterator
+
+import numpy as np
+
+CHUNK = 1 << 16
+LARGE = 1 << 22  # elements; bigger arrays go through chunked_maximum
+
+
+def maximum(a, b, out=None):
+    if np.isscalar(a) and np.isscalar(b):
+        # same rule as max_of_two(), but NaN wins from either side like numpy.maximum
+        if a != a:
+            return a
+        if b != b:
+            return b
+        return a if a > b else b
+    if isinstance(a, Iterator) or isinstance(b, Iterator):
+        return stream_maximum(a, b)
+    a = np.asarray(a) if not isinstance(a, np.memmap) else a
+    b = np.asarray(b) if not isinstance(b, np.memmap) else b
+    if isinstance(a, np.memmap) or isinstance(b, np.memmap) or max(a.size, b.size) > LARGE:
+        return chunked_maximum(a, b, out=out)
+    return np.maximum(a, b, out=out)
+
+
+def _chunks(iterable, size):
+    it = iter(iterable)
+    while True:
+        block = list(itertools.islice(it, size))
+        if not block:
+            return
+        yield np.array(block)
+
+
+def stream_maximum(a, b, chunk=CHUNK):
+    # yields numpy chunks; stops at the shorter input like zip(); a scalar on
+    # either side is compared with every value of the other
+    if np.isscalar(a) or np.isscalar(b):
+        scalar, other = (a, b) if np.isscalar(a) else (b, a)
+        for block in _chunks(other, chunk):
+            yield np.maximum(block, scalar)
+        return
+    for block_a, block_b in zip(_chunks(a, chunk), _chunks(b, chunk)):
+        n = min(len(block_a), len(block_b))
+        yield np.maximum(block_a[:n], block_b[:n])
+
+
+def chunked_maximum(a, b, out=None, chunk=CHUNK):
+    # for memory-mapped inputs: only one chunk of each is paged in at a time
+    # and the result is filled in place
+    shape = np.broadcast_shapes(np.shape(a), np.shape(b))
+    if out is None:
+        out = np.empty(shape, dtype=np.result_type(a, b))
+    if not shape:
+        return np.maximum(a, b, out=out)
+    # broadcast_to gives views, so a (1,) input against an (N,) one slices like (N,)
+    a = np.broadcast_to(a, shape)
+    b = np.broadcast_to(b, shape)
+    for start in range(0, shape[0], chunk):
+        part = slice(start, start + chunk)
+        np.maximum(a[part], b[part], out=out[part])
+    return out
+
+
+def running_max(iterable):
+    # yields the biggest value seen so far after every item
+    best = None
+    for x in iterable:
+        if best is None or x > best:
+            best = x
+        yield best
+
+
+class TopK:
+    # keeps the k largest values of an endless stream using a min-heap of size k
+    def __init__(self, k):
+        self.k = k
+        self.heap = []
+
+    def push(self, x):
+        if self.k <= 0:
+            return
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, x)
+        elif x > self.heap[0]:
+            heapq.heapreplace(self.heap, x)
+
+    def extend(self, values):
+        if self.k <= 0:
+            return
+        values = np.asarray(values)
+        if len(self.heap) == self.k:
+            # anything not bigger than the current k-th largest can't get in
+            values = values[values > self.heap[0]]
+        if len(values) > self.k:
+            values = np.partition(values, -self.k)[-self.k:]
+        for x in values.tolist():
+            self.push(x)
+
+    def items(self):
+        return sorted(self.heap, reverse=True)
+
+
+def top_k(iterable, k, chunk=CHUNK):
+    t = TopK(k)
+    for block in _chunks(iterable, chunk):
+        t.extend(block)
+    return t.items()
+
+
+if __name__ == "__main__":
+    print(maximum(5, 8), maximum(12, 4))  # 8 12
+    print(maximum([1, 9, 3], [4, 2, 6]))   # [4 9 6]
+
+    n = 5_000_000
+    rng = np.random.default_rng(0)
+    a = rng.integers(0, 10**6, n)
+    b = rng.integers(0, 10**6, n)
+
+    start = time.perf_counter()
+    loop = [x if x > y else y for x, y in zip(a.tolist(), b.tolist())]
+    t_loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vec = maximum(a, b)
+    t_vec = time.perf_counter() - start
+    assert vec.tolist() == loop
+    print(f"loop: {t_loop:.3f}s  numpy.maximum: {t_vec:.4f}s")
+
+    print("top 5:", top_k(iter(a.tolist()), 5))
@@ -1,5 +1,9 @@
 #💻 Run this in Colab/VS Code Terminal:
 # pip install pandas
 
-import pandas as pd
-print(pd.__version__)  # Check installed version
+# import pandas as pd
+# print(pd.__version__)  # works, but imports all of pandas (hundreds of ms) just for a string
+
+# Faster: read the installed version from the package metadata, pandas itself is never imported
+from importlib.metadata import version
+print(version("pandas"))  # Check installed version
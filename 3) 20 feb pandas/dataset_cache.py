@@ -0,0 +1,270 @@
+# Local cache for datasets that notebooks load with pd.read_csv(url)
+# data_manipulation.ipynb, filtering_with_pandas.ipynb and Grouping_and_aggregation.ipynb
+# download the same CSV from GitHub on every run. With this module:
+#
+#   from dataset_cache import read_csv
+#   df = read_csv(url, index_col='Unnamed: 0')      # drop-in for pd.read_csv(url)
+#
+#   - files are stored by content hash (sha256), so the same bytes are kept once
+#   - refresh=True asks the server "changed since?" (ETag / Last-Modified) and
+#     only downloads again on a real change (HTTP 304 otherwise)
+#   - the first read also saves a binary copy (parquet if pyarrow is installed,
+#     pickle otherwise) which loads much faster than parsing the CSV again
+#   - prefetch() downloads everything a notebook needs in parallel
+#
+#   python dataset_cache.py --offline        demo against a local server over "-1) datasets"
+#   python dataset_cache.py --notebook ../data_manipulation.ipynb
+
+import argparse
+import contextlib
+import functools
+import hashlib
+import http.server
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DATASETS = os.path.join(HERE, "..", "-1) datasets")
+CACHE_DIR = os.environ.get("DATASET_CACHE", os.path.join(HERE, "..", ".dataset_cache"))
+BASE_URL = os.environ.get(
+    "DATASET_BASE_URL",
+    "https://raw.githubusercontent.com/Rishabh7406/tut-codes/refs/heads/main/-1)%20datasets/")
+
+# name -> file under BASE_URL
+REGISTRY = {
+    "students": "Expanded_data_with_more_features.csv",
+    "life_expectancy": "Life Expectancy Data.csv",
+    "diabetes": "diabetes_unclean.csv",
+    "wine": "winequality-red.csv",
+}
+
+URL_PATTERN = re.compile(r"https?://[^\s\"'\\)]+(?:\)[^\s\"'\\]*)?\.csv")
+
+
+def dataset_url(name_or_url, base_url=None):
+    if "://" in name_or_url:
+        return name_or_url
+    return (base_url or BASE_URL) + urllib.parse.quote(REGISTRY[name_or_url])
+
+
+class DatasetCache:
+    def __init__(self, cache_dir=CACHE_DIR, base_url=None):
+        self.cache_dir = cache_dir
+        self.base_url = base_url
+        self.objects = os.path.join(cache_dir, "objects")
+        os.makedirs(self.objects, exist_ok=True)
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self._lock = threading.Lock()
+        self.index = {}  # url -> {"sha256", "etag", "last_modified", "checked"}
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+
+    def _save_index(self):
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp, self.index_path)
+
+    def _object(self, sha, ext=".csv"):
+        return os.path.join(self.objects, sha + ext)
+
+    def fetch(self, name_or_url, refresh=False):
+        # -> (local CSV path, status): status is "cached", "not modified" or "downloaded"
+        url = dataset_url(name_or_url, self.base_url)
+        with self._lock:
+            entry = self.index.get(url)
+        if entry and os.path.exists(self._object(entry["sha256"])) and not refresh:
+            return self._object(entry["sha256"]), "cached"
+
+        request = urllib.request.Request(url)
+        if entry and os.path.exists(self._object(entry["sha256"])):
+            if entry.get("etag"):
+                request.add_header("If-None-Match", entry["etag"])
+            if entry.get("last_modified"):
+                request.add_header("If-Modified-Since", entry["last_modified"])
+        try:
+            response = urllib.request.urlopen(request, timeout=60)
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                with self._lock:
+                    entry["checked"] = time.time()
+                    self._save_index()
+                return self._object(entry["sha256"]), "not modified"
+            raise
+
+        # stream to a temp file while hashing, then move into place under its hash
+        h = hashlib.sha256()
+        fd, tmp = tempfile.mkstemp(dir=self.objects)
+        try:
+            with response, os.fdopen(fd, "wb") as out:
+                for block in iter(lambda: response.read(1 << 20), b""):
+                    h.update(block)
+                    out.write(block)
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+            sha = h.hexdigest()
+            os.replace(tmp, self._object(sha))
+        except BaseException:
+            # a dropped connection (or Ctrl+C) must not leave half a file in objects/
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp)
+            raise
+
+        with self._lock:
+            self.index[url] = {"sha256": sha, "etag": etag, "last_modified": last_modified,
+                               "checked": time.time()}
+            self._save_index()
+        return self._object(sha), "downloaded"
+
+    def read_csv(self, name_or_url, refresh=False, **kwargs):
+        path, _ = self.fetch(name_or_url, refresh)
+        sha = os.path.basename(path)[:-4]
+        # the binary copy depends on the parse options too
+        opts = hashlib.sha256(json.dumps(kwargs, sort_keys=True, default=str).encode()).hexdigest()[:12]
+        binary = self._object(f"{sha}-{opts}", ".parquet" if _has_pyarrow() else ".pkl")
+        if os.path.exists(binary):
+            try:
+                return pd.read_parquet(binary) if binary.endswith(".parquet") else pd.read_pickle(binary)
+            except Exception:
+                os.remove(binary)  # unreadable copy: parse the CSV again below
+        df = pd.read_csv(path, **kwargs)
+        # written under a temp name and renamed, so an interrupted write leaves no broken copy
+        fd, tmp = tempfile.mkstemp(dir=self.objects)
+        os.close(fd)
+        try:
+            if binary.endswith(".parquet"):
+                df.to_parquet(tmp)
+            else:
+                df.to_pickle(tmp)
+            os.replace(tmp, binary)
+        except Exception:
+            pass  # the copy is only a speed-up (parquet needs string column names, header=None has ints)
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp)
+        return df
+
+    def prefetch(self, names_or_urls, refresh=False, workers=8):
+        # -> {url: status}, downloads run in parallel threads
+        urls = [dataset_url(n, self.base_url) for n in names_or_urls]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            statuses = pool.map(lambda u: self.fetch(u, refresh)[1], urls)
+            return dict(zip(urls, statuses))
+
+
+@functools.lru_cache(maxsize=None)
+def _has_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def notebook_datasets(path):
+    # every .csv URL mentioned in a notebook's code cells
+    with open(path, encoding="utf-8") as f:
+        nb = json.load(f)
+    urls = []
+    for cell in nb["cells"]:
+        if cell["cell_type"] == "code":
+            source = "".join(cell["source"]) if isinstance(cell["source"], list) else cell["source"]
+            urls += [u for u in URL_PATTERN.findall(source) if u not in urls]
+    return urls
+
+
+_default = None
+
+
+def read_csv(name_or_url, refresh=False, **kwargs):
+    global _default
+    if _default is None:
+        _default = DatasetCache()
+    return _default.read_csv(name_or_url, refresh, **kwargs)
+
+
+# ---------- local stand-in server (for offline runs) ----------
+
+class _Handler(http.server.SimpleHTTPRequestHandler):
+    # adds ETag / If-None-Match on top of the built-in Last-Modified handling
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if os.path.isfile(path):
+            st = os.stat(path)
+            etag = f'"{st.st_size:x}-{int(st.st_mtime):x}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return None
+            self._etag = etag
+        return super().send_head()
+
+    def end_headers(self):
+        etag = getattr(self, "_etag", None)
+        if etag:
+            self.send_header("ETag", etag)
+            self._etag = None
+        super().end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@contextlib.contextmanager
+def serve(directory=DATASETS):
+    # yields the base URL of a throwaway HTTP server for `directory`
+    handler = functools.partial(_Handler, directory=directory)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch and cache datasets")
+    parser.add_argument("names", nargs="*", help=f"dataset names {sorted(REGISTRY)} or URLs")
+    parser.add_argument("--notebook", help="prefetch every CSV URL used in this notebook")
+    parser.add_argument("--refresh", action="store_true", help="revalidate with the server")
+    parser.add_argument("--offline", action="store_true", help="demo against a local server")
+    args = parser.parse_args(argv)
+
+    if args.offline:
+        with serve() as base, tempfile.TemporaryDirectory() as tmp:
+            cache = DatasetCache(tmp, base_url=base)
+            for label, refresh in (("first run", False), ("second run", False), ("revalidate", True)):
+                start = time.perf_counter()
+                statuses = cache.prefetch(REGISTRY, refresh=refresh)
+                print(f"{label}: {sorted(set(statuses.values()))} in {time.perf_counter() - start:.3f}s")
+            for label in ("csv parse", "binary copy"):
+                start = time.perf_counter()
+                df = cache.read_csv("students", index_col=0)
+                print(f"read_csv ({label}): {df.shape} in {time.perf_counter() - start:.3f}s")
+        return 0
+
+    cache = DatasetCache()
+    targets = list(args.names)
+    if args.notebook:
+        targets += notebook_datasets(args.notebook)
+    for url, status in cache.prefetch(targets or list(REGISTRY), refresh=args.refresh).items():
+        print(f"{status:>12}  {url}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
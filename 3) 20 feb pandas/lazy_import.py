@@ -0,0 +1,116 @@
+# Lazy imports + import-time report
+# Short scripts often spend most of their run time importing libraries they
+# barely use (the IPL notebook's first cell imports numpy, pandas, matplotlib,
+# seaborn, plotly, sklearn and opendatasets before doing anything).
+#
+#   from lazy_import import lazy
+#   pd = lazy("pandas")              # nothing imported yet
+#   plt = lazy("matplotlib.pyplot")
+#   df = pd.read_csv(...)            # pandas is imported here, on first use
+#
+# Report of what a script spends on imports (uses python -X importtime):
+#   python lazy_import.py "1) version.py" nb.py
+#   python lazy_import.py -c "import pandas" --top 5
+
+import argparse
+import importlib
+import os
+import re
+import subprocess
+import sys
+import time
+
+
+class LazyModule:
+    # stands in for a module until the first attribute is used
+    def __init__(self, name):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        if self._module is None:
+            self.__dict__["_module"] = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded yet"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy(name):
+    # an already imported module is returned as is
+    return sys.modules.get(name) or LazyModule(name)
+
+
+def lazy_imports(namespace, **modules):
+    # lazy_imports(globals(), np="numpy", pd="pandas", plt="matplotlib.pyplot")
+    for alias, name in modules.items():
+        namespace[alias] = lazy(name)
+
+
+# ---------- import time report ----------
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_times(command, cwd=None):
+    # -> (wall seconds, [(package, self us, cumulative us, depth)], exit code, last error line)
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", *command], cwd=cwd,
+                          capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    rows, other = [], []
+    for line in proc.stderr.splitlines():
+        m = LINE.match(line)
+        if m:
+            rows.append((m.group(4), int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2))
+        elif line.strip() and not line.startswith("import time:"):
+            other.append(line.strip())
+    return wall, rows, proc.returncode, other[-1] if other else ""
+
+
+def summarize(rows, top=10):
+    # total time spent importing + the most expensive top-level imports
+    top_level = [r for r in rows if r[3] == 0]
+    total = sum(r[2] for r in top_level)
+    biggest = sorted(top_level, key=lambda r: r[2], reverse=True)[:top]
+    return total, biggest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show cumulative import cost per script")
+    parser.add_argument("scripts", nargs="*")
+    parser.add_argument("-c", dest="code", help="report for a code string instead of a script")
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    targets = [(s, [os.path.basename(s)], os.path.dirname(os.path.abspath(s))) for s in args.scripts]
+    if args.code:
+        targets.append((f"-c {args.code!r}", ["-c", args.code], None))
+    if not targets:
+        parser.error("give at least one script or -c CODE")
+
+    failed = 0
+    for label, command, cwd in targets:
+        wall, rows, code, error = import_times(command, cwd)
+        total, biggest = summarize(rows, args.top)
+        # a script that crashed stopped early: its timings are not a normal run
+        status = f"  FAILED (exit {code}): {error}" if code else ""
+        failed += code != 0
+        print(f"{label}: {wall * 1000:.0f} ms wall, {total / 1000:.0f} ms in imports{status}")
+        for name, _, cumulative, _ in biggest:
+            print(f"    {cumulative / 1000:8.1f} ms  {name}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,154 @@
+# Memory profiler + dtype downcaster for DataFrames
+# pd.Series([...]) / pd.DataFrame({...}) / read_csv default to int64, float64 and
+# object (Python strings), which is often 2-8x bigger than needed.
+#
+#   report(df)        per-column memory (deep), current dtype and suggested dtype
+#   downcast(df)      applies the suggestions and checks nothing changed
+#
+# Suggestions:
+#   int64   -> smallest of int8/16/32 or uint8/16/32 that fits
+#              (Int8/16/32 ... for a nullable Int64 column)
+#   float64 -> nullable Int8/16/32 if every value is a whole number (NaN -> <NA>),
+#              float32 only if every value survives the float32 round trip
+#   object  -> category when there are few distinct values
+#
+#   python mem_profile.py                  every CSV in "-1) datasets"
+#   python mem_profile.py some.csv --float-tolerance 1e-6
+
+import argparse
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+
+DATASETS = os.path.join(os.path.dirname(__file__), "..", "-1) datasets")
+
+INT_TYPES = [np.int8, np.uint8, np.int16, np.uint16, np.int32, np.uint32]
+NULLABLE = {np.int8: "Int8", np.uint8: "UInt8", np.int16: "Int16", np.uint16: "UInt16",
+            np.int32: "Int32", np.uint32: "UInt32"}
+
+
+def _smallest_int(lo, hi):
+    for t in INT_TYPES:
+        info = np.iinfo(t)
+        if info.min <= lo and hi <= info.max:
+            return t
+    return None
+
+
+def suggest(series, category_ratio=0.5, float_tolerance=0.0):
+    # -> suggested dtype (or None to keep the current one)
+    kind = series.dtype.kind
+    values = series.dropna()
+    if kind in "iu":
+        if values.empty:
+            return None
+        t = _smallest_int(values.min(), values.max())
+        if t is None or np.dtype(t).itemsize >= series.dtype.itemsize:
+            return None
+        # Int64 & co. (or anything holding <NA>) stay nullable: a numpy int can't hold NA
+        if isinstance(series.dtype, pd.api.extensions.ExtensionDtype) or len(values) < len(series):
+            return pd.api.types.pandas_dtype(NULLABLE[t])
+        return np.dtype(t)
+    if kind == "f":
+        if values.empty:
+            return None
+        if np.array_equal(values, np.round(values)):
+            t = _smallest_int(values.min(), values.max())
+            if t is not None:
+                return pd.api.types.pandas_dtype(NULLABLE[t])
+        if series.dtype.itemsize > 4:
+            as32 = values.to_numpy().astype(np.float32).astype(series.dtype)
+            if np.allclose(as32, values.to_numpy(), rtol=float_tolerance, atol=0) if float_tolerance \
+                    else np.array_equal(as32, values.to_numpy()):
+                return np.dtype(np.float32)
+        return None
+    if kind == "O" or pd.api.types.is_string_dtype(series.dtype):
+        if len(series) and series.nunique(dropna=True) / len(series) <= category_ratio:
+            return pd.CategoricalDtype()
+    return None
+
+
+def _same(before, after, float_tolerance=0.0):
+    # round trip check: does `after` still hold exactly the values of `before`?
+    if isinstance(after.dtype, pd.CategoricalDtype):
+        after = after.astype(object)
+        before = before.astype(object)
+        return bool(((before == after) | (before.isna() & after.isna())).all())
+    back = after.astype("float64" if before.dtype.kind == "f" else before.dtype)
+    if before.dtype.kind == "f":
+        a, b = before.to_numpy(), back.to_numpy(dtype=float, na_value=np.nan)
+        if float_tolerance:
+            return bool(np.allclose(a, b, rtol=float_tolerance, atol=0, equal_nan=True))
+        return bool(np.array_equal(a, b, equal_nan=True))
+    return bool(before.equals(back))
+
+
+def report(df, category_ratio=0.5, float_tolerance=0.0):
+    rows = []
+    for col in df.columns:
+        s = df[col]
+        target = suggest(s, category_ratio, float_tolerance)
+        after = s.astype(target) if target is not None else s
+        rows.append({
+            "column": col,
+            "dtype": str(s.dtype),
+            "suggested": str(target) if target is not None else "",
+            "bytes": int(s.memory_usage(deep=True, index=False)),
+            "bytes_after": int(after.memory_usage(deep=True, index=False)),
+        })
+    out = pd.DataFrame(rows).set_index("column")
+    out["saved_%"] = (100 * (1 - out["bytes_after"] / out["bytes"])).round(1)
+    return out
+
+
+def downcast(df, category_ratio=0.5, float_tolerance=0.0, verify=True):
+    # -> smaller copy of df; raises ValueError if a column would change its values
+    result = {}
+    for col in df.columns:
+        s = df[col]
+        target = suggest(s, category_ratio, float_tolerance)
+        new = s.astype(target) if target is not None else s
+        if verify and target is not None and not _same(s, new, float_tolerance):
+            raise ValueError(f"downcasting {col!r} to {target} changes its values")
+        result[col] = new
+    return pd.DataFrame(result, index=df.index)
+
+
+def profile_file(path, **options):
+    df = pd.read_csv(path)
+    before = df.memory_usage(deep=True).sum()
+    small = downcast(df, **options)
+    after = small.memory_usage(deep=True).sum()
+    return report(df, **{k: v for k, v in options.items() if k != "verify"}), before, after
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report and shrink DataFrame memory")
+    parser.add_argument("paths", nargs="*", help='CSV files (default: every file in "-1) datasets")')
+    parser.add_argument("--category-ratio", type=float, default=0.5,
+                        help="max distinct/rows ratio for turning text into category")
+    parser.add_argument("--float-tolerance", type=float, default=0.0,
+                        help="allow float32 when values match within this relative tolerance")
+    parser.add_argument("--columns", action="store_true", help="print the per-column table too")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or sorted(glob.glob(os.path.join(DATASETS, "*.csv")))
+    pd.set_option("display.width", 140)
+    total_before = total_after = 0
+    for path in paths:
+        table, before, after = profile_file(path, category_ratio=args.category_ratio,
+                                            float_tolerance=args.float_tolerance)
+        total_before += before
+        total_after += after
+        print(f"{os.path.basename(path):45} {before / 1e6:8.2f} MB -> {after / 1e6:6.2f} MB "
+              f"({100 * (1 - after / before):.0f}% smaller)")
+        if args.columns:
+            print(table.to_string(), "\n")
+    print(f"{'total':45} {total_before / 1e6:8.2f} MB -> {total_after / 1e6:6.2f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
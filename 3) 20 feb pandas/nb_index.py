@@ -0,0 +1,247 @@
+# Search index over all notebooks (and the dumps/*.json notebook sources)
+# Finding which notebook uses groupby, merge or a column like 'Salary' means opening
+# every .ipynb. This builds an inverted index once:
+#   call:<name>     methods/functions called        df.groupby(...) -> call:groupby
+#                                                   pd.merge(...)   -> call:merge, call:pd.merge
+#   column:<name>   string subscripts and column keywords   df['Age'], on='ID', hue='sex'
+#   word:<token>    every identifier / word in code and markdown
+# each pointing at the (notebook, cell) pairs that contain it. The index is pickled
+# next to the repo (.nbindex.pickle) and on the next run only notebooks whose
+# mtime/size changed are parsed again.
+#
+#   python nb_index.py groupby                     any kind: call, column or word
+#   python nb_index.py call:merge column:ID        cells that have both
+#   python nb_index.py --any call:merge call:concat
+#   python nb_index.py "column:sal*"               prefix match
+#   python nb_index.py --stats / --rebuild
+
+import argparse
+import ast
+import glob
+import json
+import os
+import pickle
+import re
+import sys
+import time
+
+from nb_runner import strip_magics
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+INDEX_PATH = os.path.join(ROOT, ".nbindex.pickle")
+SOURCES = ["**/*.ipynb", "dumps/*.json"]
+SKIP_DIRS = {".git", ".nbcache", ".ipynb_checkpoints", ".dataset_cache", "report_cache"}
+KINDS = ("call", "column", "word")
+
+WORD = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+# fallbacks for cells that don't parse as Python
+CALL = re.compile(r"(?:([A-Za-z_]\w*)\.)?([A-Za-z_]\w*)\s*\(")
+SUBSCRIPT = re.compile(r"\[\s*['\"]([^'\"\]]+)['\"]\s*[\],]")
+COLUMN_KEYWORDS = {"on", "left_on", "right_on", "by", "columns", "subset", "x", "y", "hue",
+                   "index", "values", "id_vars", "value_vars"}
+
+
+def notebook_files(root=ROOT):
+    files = set()
+    for pattern in SOURCES:
+        for path in glob.glob(os.path.join(root, pattern), recursive=True):
+            if not SKIP_DIRS.intersection(os.path.relpath(path, root).split(os.sep)):
+                files.add(os.path.relpath(path, root))
+    return sorted(files)
+
+
+def _strings(node):
+    # 'a' -> ['a'], ['a', 'b'] -> ['a', 'b']
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return [node.value]
+    if isinstance(node, (ast.List, ast.Tuple)):
+        return [e.value for e in node.elts if isinstance(e, ast.Constant) and isinstance(e.value, str)]
+    return []
+
+
+def code_terms(source):
+    # -> set of "call:..." / "column:..." terms for one code cell
+    terms = set()
+    try:
+        tree = ast.parse(strip_magics(source))
+    except SyntaxError:
+        for obj, name in CALL.findall(source):
+            terms.add(f"call:{name}")
+            if obj:
+                terms.add(f"call:{obj}.{name}")
+        terms.update(f"column:{c}" for c in SUBSCRIPT.findall(source))
+        return terms
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            func = node.func
+            if isinstance(func, ast.Attribute):
+                terms.add(f"call:{func.attr}")
+                if isinstance(func.value, ast.Name):
+                    terms.add(f"call:{func.value.id}.{func.attr}")
+            elif isinstance(func, ast.Name):
+                terms.add(f"call:{func.id}")
+            for kw in node.keywords:
+                if kw.arg in COLUMN_KEYWORDS:
+                    terms.update(f"column:{c}" for c in _strings(kw.value))
+            # df.groupby('Department') / df.sort_values('Age')
+            if isinstance(func, ast.Attribute) and func.attr in ("groupby", "sort_values", "drop",
+                                                                  "set_index", "pivot_table") and node.args:
+                terms.update(f"column:{c}" for c in _strings(node.args[0]))
+        elif isinstance(node, ast.Subscript):
+            key = node.slice
+            if isinstance(key, ast.Tuple) and len(key.elts) == 2:  # df.loc[:, 'Age']
+                key = key.elts[1]
+            terms.update(f"column:{c}" for c in _strings(key))
+    return terms
+
+
+def cell_terms(cell_type, source):
+    terms = {f"word:{w.lower()}" for w in WORD.findall(source) if len(w) > 1}
+    if cell_type == "code":
+        terms |= {t.lower() for t in code_terms(source)}
+    return terms
+
+
+def parse_notebook(path):
+    # -> {"cells": [(type, preview)], "postings": {term: [cell numbers]}}
+    with open(path, encoding="utf-8") as f:
+        nb = json.load(f)
+    cells, postings = [], {}
+    for n, cell in enumerate(nb.get("cells", [])):
+        source = cell.get("source", "")
+        source = "".join(source) if isinstance(source, list) else source
+        preview = next((line.strip() for line in source.splitlines() if line.strip()), "")[:80]
+        cells.append((cell.get("cell_type", "?"), preview))
+        for term in cell_terms(cell.get("cell_type"), source):
+            postings.setdefault(term, []).append(n)
+    return {"cells": cells, "postings": postings}
+
+
+class NotebookIndex:
+    def __init__(self, root=ROOT, path=INDEX_PATH):
+        self.root = root
+        self.path = path
+        self.files = {}   # relpath -> {"stamp": (mtime_ns, size), "cells", "postings"}
+        self.terms = {}   # term -> [(relpath, cell number)]
+
+    @classmethod
+    def load(cls, root=ROOT, path=INDEX_PATH):
+        index = cls(root, path)
+        if os.path.exists(path):
+            try:
+                with open(path, "rb") as f:
+                    index.files, index.terms = pickle.load(f)
+            except Exception:
+                index.files, index.terms = {}, {}  # unreadable cache: rebuild
+        return index
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump((self.files, self.terms), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.path)
+
+    def update(self):
+        # -> (parsed, removed): re-reads only notebooks whose mtime or size changed
+        current = notebook_files(self.root)
+        parsed = 0
+        for rel in current:
+            st = os.stat(os.path.join(self.root, rel))
+            stamp = (st.st_mtime_ns, st.st_size)
+            entry = self.files.get(rel)
+            if entry is not None and entry["stamp"] == stamp:
+                continue
+            try:
+                entry = parse_notebook(os.path.join(self.root, rel))
+            except (ValueError, UnicodeDecodeError):
+                entry = {"cells": [], "postings": {}}  # not a notebook after all
+            entry["stamp"] = stamp
+            self.files[rel] = entry
+            parsed += 1
+        removed = set(self.files) - set(current)
+        for rel in removed:
+            del self.files[rel]
+        if parsed or removed or not self.terms:
+            self._merge()
+            self.save()
+        return parsed, len(removed)
+
+    def _merge(self):
+        terms = {}
+        for rel, entry in self.files.items():
+            for term, cells in entry["postings"].items():
+                terms.setdefault(term, []).extend((rel, n) for n in cells)
+        self.terms = terms
+
+    def lookup(self, query):
+        # one query term -> set of (relpath, cell); "kind:" is optional, a trailing * is a prefix
+        query = query.lower()
+        kinds = KINDS
+        if ":" in query and query.split(":", 1)[0] in KINDS:
+            kind, query = query.split(":", 1)
+            kinds = (kind,)
+        if query.endswith("*"):
+            prefixes = tuple(f"{k}:{query[:-1]}" for k in kinds)
+            keys = [t for t in self.terms if t.startswith(prefixes)]
+        else:
+            keys = [f"{k}:{query}" for k in kinds]
+        hits = set()
+        for key in keys:
+            hits.update(self.terms.get(key, ()))
+        return hits
+
+    def search(self, queries, any_of=False):
+        sets = [self.lookup(q) for q in queries]
+        if not sets:
+            return []
+        hits = set.union(*sets) if any_of else set.intersection(*sets)
+        return sorted(hits)
+
+    def cell(self, rel, n):
+        return self.files[rel]["cells"][n]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search code and markdown across all notebooks")
+    parser.add_argument("terms", nargs="*", help="e.g. groupby, call:merge, column:Age, word:missing, sal*")
+    parser.add_argument("--any", action="store_true", help="cells with any of the terms (default: all)")
+    parser.add_argument("--files", action="store_true", help="only list matching notebooks")
+    parser.add_argument("--rebuild", action="store_true", help="drop the saved index first")
+    parser.add_argument("--stats", action="store_true", help="show index size and the most used calls")
+    args = parser.parse_intermixed_args(argv)
+
+    start = time.perf_counter()
+    index = NotebookIndex(path=INDEX_PATH) if args.rebuild else NotebookIndex.load()
+    parsed, removed = index.update()
+    loaded = time.perf_counter() - start
+
+    if args.stats or not args.terms:
+        cells = sum(len(e["cells"]) for e in index.files.values())
+        print(f"{len(index.files)} notebooks, {cells} cells, {len(index.terms)} terms "
+              f"({parsed} parsed, {removed} removed) in {loaded * 1000:.1f} ms")
+        calls = sorted((t for t in index.terms if t.startswith("call:")),
+                       key=lambda t: len(index.terms[t]), reverse=True)[:15]
+        print("most used calls:", ", ".join(f"{t[5:]} ({len(index.terms[t])})" for t in calls))
+        return 0
+
+    start = time.perf_counter()
+    hits = index.search(args.terms, args.any)
+    took = time.perf_counter() - start
+    if args.files:
+        counts = {}
+        for rel, _ in hits:
+            counts[rel] = counts.get(rel, 0) + 1
+        for rel, count in counts.items():
+            print(f"{count:4} cells  {rel}")
+    else:
+        for rel, n in hits:
+            cell_type, preview = index.cell(rel, n)
+            print(f"{rel} [cell {n}, {cell_type}]  {preview}")
+    print(f"{len(hits)} cells ({loaded * 1000:.1f} ms load/update, {took * 1000:.2f} ms query)",
+          file=sys.stderr)
+    return 0 if hits else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,455 @@
+# Incremental notebook runner
+# Re-running a whole notebook after one small edit is slow (kagle_ipl.ipynb has
+# 137 cells with big merges and applys). This runner:
+#   1. reads which variables each code cell uses and which it sets (via ast)
+#   2. links every cell to the earlier cells that set what it uses
+#   3. keys each cell by hash(its code + keys of the cells it depends on)
+#   4. caches each cell's printed output and the variables it set (pickled)
+# On the next run, a cell whose key is cached is restored instead of executed,
+# so only edited cells and the cells downstream of them run again.
+# Cells that still have to run are scheduled on their dependency graph: each one
+# starts in a worker process as soon as the cells it reads from are done, seeded
+# from their cached variables, so independent branches run side by side.
+#
+#   python nb_runner.py ../projects/kagle_ipl.ipynb --show
+#   python nb_runner.py notebook.ipynb --clear     (drop the cache first)
+#
+# Limits: mutation through plain method calls (df.drop(..., inplace=True) is
+# handled, lst.append(x) is not) is only seen when it looks like an assignment;
+# variables that can't be pickled (lambdas, open files, figures) are not cached,
+# so the cell that makes them always runs (and runs again inside any worker that
+# needs its variables); cells that talk through files rather than variables are
+# not ordered against each other.
+
+import argparse
+import ast
+import builtins
+import contextlib
+import hashlib
+import io
+import json
+import os
+import pickle
+import shutil
+import sys
+import time
+import traceback
+import types
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+CACHE_DIR = ".nbcache"
+BUILTINS = set(dir(builtins))
+
+
+# ---------- reading cells ----------
+
+def load_cells(path):
+    with open(path, encoding="utf-8") as f:
+        nb = json.load(f)
+    cells = []
+    for i, cell in enumerate(nb["cells"]):
+        if cell["cell_type"] != "code":
+            continue
+        source = cell["source"]
+        source = "".join(source) if isinstance(source, list) else source
+        cells.append({"index": i, "source": strip_magics(source)})
+    return cells
+
+
+def strip_magics(source):
+    # !shell, %magic and bare "pip install" lines don't run outside Jupyter
+    lines = []
+    for line in source.splitlines():
+        s = line.strip()
+        if s.startswith(("!", "%")) or s.startswith("pip install"):
+            lines.append("")
+        else:
+            lines.append(line)
+    return "\n".join(lines)
+
+
+class _Names(ast.NodeVisitor):
+    def __init__(self):
+        self.loads = set()
+        self.stores = set()
+
+    def visit_Name(self, node):
+        (self.loads if isinstance(node.ctx, ast.Load) else self.stores).add(node.id)
+
+    def _base(self, node):
+        while isinstance(node, (ast.Subscript, ast.Attribute)):
+            node = node.value
+        return node.id if isinstance(node, ast.Name) else None
+
+    def _target(self, target):
+        # df['x'] = ... / df.x = ... change df
+        if isinstance(target, (ast.Subscript, ast.Attribute)):
+            base = self._base(target)
+            if base:
+                self.stores.add(base)
+                self.loads.add(base)
+
+    def visit_Assign(self, node):
+        for t in node.targets:
+            self._target(t)
+        self.generic_visit(node)
+
+    def visit_AugAssign(self, node):
+        self._target(node.target)
+        if isinstance(node.target, ast.Name):
+            self.loads.add(node.target.id)
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        # df.dropna(inplace=True) changes df
+        if isinstance(node.func, ast.Attribute) and any(
+                k.arg == "inplace" and isinstance(k.value, ast.Constant) and k.value.value is True
+                for k in node.keywords):
+            base = self._base(node.func.value)
+            if base:
+                self.stores.add(base)
+        self.generic_visit(node)
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            self.stores.add((alias.asname or alias.name).split(".")[0])
+
+    visit_ImportFrom = visit_Import
+
+    def _scoped(self, node, own_names):
+        # names bound inside a function / lambda / comprehension are local to it
+        inner = _Names()
+        for child in ast.iter_child_nodes(node):
+            inner.visit(child)
+        self.loads |= inner.loads - inner.stores - own_names
+
+    def visit_FunctionDef(self, node):
+        self.stores.add(node.name)
+        args = {a.arg for a in ast.walk(node.args) if isinstance(a, ast.arg)}
+        self._scoped(node, args)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node):
+        self.stores.add(node.name)
+        self._scoped(node, set())
+
+    def visit_Lambda(self, node):
+        self._scoped(node, {a.arg for a in ast.walk(node.args) if isinstance(a, ast.arg)})
+
+    def _comp(self, node):
+        self._scoped(node, set())
+
+    visit_ListComp = visit_SetComp = visit_DictComp = visit_GeneratorExp = _comp
+
+
+def analyze(source):
+    # -> (names read from earlier cells, names set) or None if it doesn't parse
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return None
+    reads, writes = set(), set()
+    for stmt in tree.body:
+        v = _Names()
+        v.visit(stmt)
+        reads |= v.loads - writes  # a name set earlier in the same cell is local
+        writes |= v.stores
+    return reads - BUILTINS, writes
+
+
+def build_graph(cells):
+    # fills cell["deps"], cell["reads"], cell["writes"]
+    last_writer = {}
+    for n, cell in enumerate(cells):
+        names = analyze(cell["source"])
+        if names is None:
+            # can't tell what it does: depend on everything before it
+            cell["reads"], cell["writes"] = set(), set()
+            cell["deps"] = list(range(n))
+            cell["barrier"] = True
+        else:
+            cell["reads"], cell["writes"] = names
+            cell["deps"] = sorted({last_writer[name] for name in cell["reads"] if name in last_writer})
+            cell["barrier"] = False
+        for name in cell["writes"]:
+            last_writer[name] = n
+        if cell["barrier"]:
+            for name in list(last_writer):
+                last_writer[name] = n
+    return cells
+
+
+def cell_keys(cells):
+    for cell in cells:
+        h = hashlib.sha256(cell["source"].encode())
+        for d in cell["deps"]:
+            h.update(cells[d]["key"].encode())
+        cell["key"] = h.hexdigest()[:32]
+
+
+def depth(cells):
+    # cells on the longest dependency chain: the most that has to run one after another
+    longest = []
+    for cell in cells:
+        longest.append(1 + max((longest[d] for d in cell["deps"]), default=0))
+    return max(longest, default=0)
+
+
+# ---------- running ----------
+
+def _pack(namespace, names):
+    # modules are stored by name and re-imported; anything unpicklable -> None
+    packed = {}
+    for name in names:
+        if name not in namespace:
+            continue
+        value = namespace[name]
+        if isinstance(value, types.ModuleType):
+            packed[name] = ("module", value.__name__)
+            continue
+        try:
+            packed[name] = ("value", pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            return None
+    return packed
+
+
+def _unpack(packed, namespace):
+    for name, (kind, data) in packed.items():
+        if kind == "module":
+            __import__(data)
+            namespace[name] = sys.modules[data]
+        else:
+            namespace[name] = pickle.loads(data)
+
+
+def _display(*objs, **kwargs):
+    # stand-in for IPython's display() when IPython isn't installed
+    for obj in objs:
+        print(repr(obj))
+
+
+def _namespace():
+    # what a notebook cell can use without importing it
+    try:
+        from IPython.display import display
+    except ImportError:
+        display = _display
+    return {"__name__": "__main__", "display": display}
+
+
+def _execute(source, namespace):
+    # like a notebook cell: the value of a last bare expression is shown
+    tree = ast.parse(source)
+    last = None
+    if tree.body and isinstance(tree.body[-1], ast.Expr):
+        last = ast.Expression(tree.body.pop().value)
+    exec(compile(tree, "<cell>", "exec"), namespace)
+    if last is not None:
+        value = eval(compile(last, "<cell>", "eval"), namespace)
+        if value is not None:
+            print(repr(value))
+
+
+@contextlib.contextmanager
+def _in_dir(path):
+    # cells use relative paths (read_csv('data.csv')), so run them next to the notebook
+    old = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(old)
+
+
+def _paths(cache_dir, cell):
+    base = os.path.join(cache_dir, cell["key"])
+    return base + ".pkl", base + ".out"  # variables, printed output
+
+
+def _run_cell(cell, namespace, cache_dir):
+    # executes one cell in `namespace` and caches what it set
+    out = io.StringIO()
+    status = "ran"
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(out):
+        try:
+            _execute(cell["source"], namespace)
+        except Exception:
+            traceback.print_exc(file=out)
+            status = "error"
+    seconds = time.perf_counter() - start
+
+    if status == "ran":
+        packed = _pack(namespace, cell["writes"])
+        if packed is None:
+            status = "ran (not cacheable)"
+        else:
+            vars_path, out_path = _paths(cache_dir, cell)
+            with open(vars_path + ".tmp", "wb") as f:
+                pickle.dump(packed, f, protocol=pickle.HIGHEST_PROTOCOL)
+            with open(out_path, "w", encoding="utf-8") as f:
+                f.write(out.getvalue())
+            os.replace(vars_path + ".tmp", vars_path)  # .pkl last: it marks the entry complete
+    return {"index": cell["index"], "status": status, "output": out.getvalue(), "seconds": seconds}
+
+
+def _values(cells, n, cache_dir, memo):
+    # -> the variables cell n set: from its cache entry, or by running it (and, the same
+    # way, whatever it depends on) in a private namespace when it couldn't be cached
+    if n not in memo:
+        vars_path, _ = _paths(cache_dir, cells[n])
+        namespace = _namespace()
+        if os.path.exists(vars_path):
+            with open(vars_path, "rb") as f:
+                _unpack(pickle.load(f), namespace)
+        else:
+            _seed(cells, n, namespace, cache_dir, memo)
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                _execute(cells[n]["source"], namespace)
+        memo[n] = {name: namespace[name] for name in cells[n]["writes"] if name in namespace}
+    return memo[n]
+
+
+def _seed(cells, n, namespace, cache_dir, memo):
+    # the variables of cell n's upstream cells, in notebook order (later writers win)
+    for d in cells[n]["deps"]:
+        namespace.update(_values(cells, d, cache_dir, memo))
+
+
+def run_cell(cells, n, cache_dir, workdir):
+    # runs in a worker: cell n on top of its upstream cells' cached variables
+    with _in_dir(workdir):
+        namespace = _namespace()
+        try:
+            _seed(cells, n, namespace, cache_dir, {})
+        except Exception:
+            return {"index": cells[n]["index"], "status": "error", "seconds": 0.0,
+                    "output": "could not rebuild the inputs of this cell:\n" + traceback.format_exc()}
+        return _run_cell(cells[n], namespace, cache_dir)
+
+
+def run_in_order(cells, todo, cache_dir, workdir):
+    # one process, one namespace, notebook order: cached cells are restored, others run
+    results = {}
+    with _in_dir(workdir):
+        namespace = _namespace()
+        failed = set()
+        for n, cell in enumerate(cells):
+            if n not in todo:
+                with open(_paths(cache_dir, cell)[0], "rb") as f:
+                    _unpack(pickle.load(f), namespace)
+            elif failed.intersection(cell["deps"]):
+                failed.add(n)
+            else:
+                results[n] = _run_cell(cell, namespace, cache_dir)
+                if results[n]["status"] == "error":
+                    failed.add(n)
+    return results
+
+
+def run_dag(cells, todo, cache_dir, workdir, workers=None):
+    # a cell is submitted as soon as every upstream cell it needs is done, so
+    # independent branches of the notebook run at the same time
+    results = {}
+    waiting = {n: {d for d in cells[n]["deps"] if d in todo} for n in todo}
+    failed = set()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        running = {}
+
+        def submit_ready():
+            for n in sorted(n for n, deps in waiting.items() if not deps):
+                del waiting[n]
+                running[pool.submit(run_cell, cells, n, cache_dir, workdir)] = n
+
+        submit_ready()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                n = running.pop(future)
+                results[n] = future.result()
+                ok = results[n]["status"] != "error"
+                if not ok:
+                    failed.add(n)
+                for m, deps in list(waiting.items()):
+                    if n in deps:
+                        deps.discard(n)
+                        if not ok:
+                            failed.add(m)
+            # cells below a failed cell are not run (they would only fail the same way)
+            for m in [m for m in waiting if failed.intersection(cells[m]["deps"]) and not waiting[m]]:
+                del waiting[m]
+                failed.add(m)
+            submit_ready()
+    return results
+
+
+def run_notebook(path, cache_dir=None, workers=None):
+    cells = build_graph(load_cells(path))
+    cell_keys(cells)
+    workdir = os.path.dirname(os.path.abspath(path))
+    cache_dir = os.path.abspath(cache_dir or os.path.join(
+        workdir, CACHE_DIR, os.path.splitext(os.path.basename(path))[0]))
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # cached cells are answered here without loading their variables
+    todo = set()
+    results = {}
+    for n, cell in enumerate(cells):
+        vars_path, out_path = _paths(cache_dir, cell)
+        if os.path.exists(vars_path) and os.path.exists(out_path):
+            with open(out_path, encoding="utf-8") as f:
+                results[n] = {"index": cell["index"], "status": "cached", "output": f.read(), "seconds": 0.0}
+        else:
+            todo.add(n)
+
+    payload = [{k: cell[k] for k in ("index", "source", "key", "writes", "deps")} for cell in cells]
+    if workers == 1 or len(todo) <= 1:
+        results.update(run_in_order(payload, todo, cache_dir, workdir))
+    else:
+        results.update(run_dag(payload, todo, cache_dir, workdir, workers))
+    for n in todo - set(results):
+        results[n] = {"index": cells[n]["index"], "status": "skipped (upstream error)",
+                      "output": "", "seconds": 0.0}
+    return cells, [results[n] for n in sorted(results)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a notebook, re-executing only changed cells")
+    parser.add_argument("notebook")
+    parser.add_argument("--cache-dir")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--clear", action="store_true", help="delete the cache before running")
+    parser.add_argument("--show", action="store_true", help="print every cell's output")
+    parser.add_argument("--graph", action="store_true", help="only print the dependency graph")
+    args = parser.parse_args(argv)
+
+    if args.graph:
+        cells = build_graph(load_cells(args.notebook))
+        for cell in cells:
+            deps = [cells[d]["index"] for d in cell["deps"]]
+            print(f"cell {cell['index']:3}: reads {sorted(cell['reads'])} writes {sorted(cell['writes'])} <- {deps}")
+        return 0
+
+    if args.clear:
+        workdir = os.path.dirname(os.path.abspath(args.notebook))
+        stem = os.path.splitext(os.path.basename(args.notebook))[0]
+        shutil.rmtree(args.cache_dir or os.path.join(workdir, CACHE_DIR, stem), ignore_errors=True)
+
+    start = time.perf_counter()
+    cells, results = run_notebook(args.notebook, args.cache_dir, args.workers)
+    for r in results:
+        if args.show or r["status"] == "error":
+            print(f"--- cell {r['index']} [{r['status']}, {r['seconds']:.3f}s]")
+            print(r["output"], end="" if r["output"].endswith("\n") or not r["output"] else "\n")
+    counts = {}
+    for r in results:
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+    print(f"{len(cells)} code cells, longest dependency chain {depth(cells)}: {counts} "
+          f"in {time.perf_counter() - start:.2f}s")
+    return 1 if "error" in counts else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,376 @@
+# Benchmarks for the example scripts
+# Every case wraps the core of one script and runs it for a few input sizes.
+# For each (case, size) we record:
+#   seconds      median wall time per call over --rounds samples (best: the fastest)
+#   relative     median of sample time / a fixed reference loop timed right after it,
+#                plus its spread (median absolute deviation) between samples
+#   peak_kb      peak memory traced by tracemalloc during one run
+#   retained_blocks  memory blocks one run allocated and still holds at its end
+#                (count from a tracemalloc snapshot). This is not an allocation
+#                count: temporaries freed before the run returns don't show up
+#                here, only in peak_kb if they were big enough
+# Results are appended to history.json. After --save-baseline, every run is
+# compared with baseline.json and the script exits with 1 when a case got more
+# than --threshold slower (median relative time, beyond its noise) or bigger
+# (peak memory or retained blocks).
+#
+#   python benchmarks/run_benchmarks.py --save-baseline      first time
+#   python benchmarks/run_benchmarks.py                      later runs
+#   python benchmarks/run_benchmarks.py -k factorial --threshold 0.5
+#
+# Everything runs locally: scripts that read/write files run in a temp folder,
+# input() is never called and random inputs use a fixed seed.
+
+import argparse
+import ast
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import random
+import runpy
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from functools import reduce
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+HISTORY = os.path.join(HERE, "history.json")
+BASELINE = os.path.join(HERE, "baseline.json")
+
+# differences smaller than this are noise, not regressions
+MIN_SECONDS = 50e-6
+MIN_KB = 4
+MIN_BLOCKS = 64
+NOISE_SPREADS = 4  # a slowdown must also exceed this many median absolute deviations
+
+CASES = {}  # name -> (sizes, make); make(size) -> function to time
+
+
+def case(name, sizes):
+    def register(make):
+        CASES[name] = (sizes, make)
+        return make
+    return register
+
+
+def script(*parts):
+    return os.path.join(ROOT, *parts)
+
+
+def load_defs(path):
+    # only the imports, functions and classes of a script, without its top-level
+    # code (factorial.py would otherwise stop at input())
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    keep = (ast.Import, ast.ImportFrom, ast.FunctionDef, ast.ClassDef)
+    tree.body = [node for node in tree.body if isinstance(node, keep)]
+    namespace = {"__name__": os.path.basename(path)}
+    exec(compile(tree, path, "exec"), namespace)
+    return namespace
+
+
+def run_script(path, init_globals=None):
+    # runs a whole script with its prints swallowed
+    with contextlib.redirect_stdout(io.StringIO()):
+        return runpy.run_path(path, init_globals=init_globals, run_name="__main__")
+
+
+@contextlib.contextmanager
+def workdir():
+    # a fresh temp folder as cwd, so scripts that use relative paths stay local
+    old = os.getcwd()
+    tmp = tempfile.mkdtemp(prefix="bench-")
+    os.chdir(tmp)
+    try:
+        yield tmp
+    finally:
+        os.chdir(old)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+# ---------- cases ----------
+
+@case("factorial", sizes=[100, 1000, 3000])
+def _factorial(n):
+    factorial = load_defs(script("0) misc", "factorial.py"))["factorial"]
+    return lambda: factorial(n)
+
+
+@case("map_filter_reduce", sizes=[1_000, 100_000])
+def _map_f_r(n):
+    # same three calls as map_f_r.py, on n numbers instead of 5
+    nums = list(range(1, n + 1))
+
+    def run():
+        squared = list(map(lambda x: x**2, nums))
+        evens = list(filter(lambda x: x % 2 == 0, nums))
+        sum_all = reduce(lambda x, y: x + y, nums)
+        return squared, evens, sum_all
+    return run
+
+
+@case("map_f_r.py", sizes=[1])
+def _map_f_r_script(n):
+    return lambda: run_script(script("2)19 feb python", "map_f_r.py"))
+
+
+@case("range", sizes=[1_000, 100_000])
+def _range(n):
+    # the list / comprehension / sum patterns from "2) range.py"
+    def run():
+        forward = list(range(n))
+        evens = list(range(2, n + 1, 2))
+        reverse = list(range(n, 0, -2))
+        squares = [x**2 for x in range(1, n + 1)]
+        return forward, evens, reverse, squares, sum(range(1, n + 1))
+    return run
+
+
+@case("range.py", sizes=[1])
+def _range_script(n):
+    return lambda: run_script(script("1) 14 feb python l2", "2) range.py"))
+
+
+@case("abstraction_area", sizes=[1_000, 100_000])
+def _shapes(n):
+    defs = load_defs(script("2)19 feb python", "class", "Abstraction.py"))
+    rng = random.Random(42)
+    shapes = [defs["Circle"](rng.randint(1, 100)) if rng.random() < 0.5
+              else defs["Rectangle"](rng.randint(1, 100), rng.randint(1, 100)) for _ in range(n)]
+    return lambda: sum(shape.area() for shape in shapes)
+
+
+@case("file_handling", sizes=[10, 1_000])
+def _file_handling(n):
+    # write.py once, append.py n times, then read.py (all in a temp folder)
+    folder = script("2)19 feb python", "file handling")
+
+    def run():
+        with workdir():
+            run_script(os.path.join(folder, "write.py"))
+            for _ in range(n):
+                run_script(os.path.join(folder, "append.py"))
+            run_script(os.path.join(folder, "read.py"))
+    return run
+
+
+@case("nb.py", sizes=[1])
+def _nb(n):
+    # nb.py writes its notebooks under ./tut-codes/-2) notebooks/1) pandas/
+    def run():
+        with workdir():
+            os.makedirs(os.path.join("tut-codes", "-2) notebooks", "1) pandas"))
+            run_script(script("3) 20 feb pandas", "nb.py"))
+    return run
+
+
+@case("json_to_ipynb", sizes=[4, 40])
+def _json_to_ipynb(n):
+    # tempCodeRunnerFile.py converts every .json in input_folder with nbformat;
+    # the n inputs are copies of the notebooks in dumps/
+    try:
+        import nbformat
+    except ImportError:
+        return None
+    dumps = sorted(f for f in os.listdir(script("dumps")) if f.endswith(".json"))
+
+    def run():
+        with workdir() as tmp:
+            src, dst = os.path.join(tmp, "in"), os.path.join(tmp, "out")
+            os.makedirs(src)
+            os.makedirs(dst)
+            for i in range(n):
+                name = dumps[i % len(dumps)]
+                shutil.copy(script("dumps", name), os.path.join(src, f"{i}_{name}"))
+            run_script(script("3) 20 feb pandas", "tempCodeRunnerFile.py"),
+                       {"os": os, "json": json, "nbformat": nbformat,
+                        "input_folder": src, "output_folder": dst})
+    return run
+
+
+# ---------- measuring ----------
+
+def loops_for(func, target=0.05):
+    # like timeit's autorange: call fast cases several times per sample so
+    # timer resolution and scheduling noise don't dominate
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        if time.perf_counter() - start >= target or loops >= 10_000:
+            return loops
+        loops *= 2
+
+
+def reference():
+    # a fixed pure-Python loop timed between the samples of every case; comparing
+    # seconds/reference instead of seconds cancels out the machine being busier
+    # or throttled today
+    start = time.perf_counter()
+    total = 0
+    for i in range(100_000):
+        total += i * i % 7
+    return time.perf_counter() - start
+
+
+def sample(func, loops):
+    # one timing sample: seconds per call, and the same divided by a reference run
+    # timed right after it (a throttled or busy machine slows both down together)
+    gc.collect()
+    start = time.perf_counter()
+    for _ in range(loops):
+        func()
+    seconds = (time.perf_counter() - start) / loops
+    return seconds, seconds / reference()
+
+
+def memory(func):
+    # peak traced bytes and number of blocks the run allocated and still holds at its
+    # end (tracemalloc snapshot; the return value is kept alive until then)
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, tracemalloc.__file__)])
+    tracemalloc.stop()
+    del result
+    return peak, sum(stat.count for stat in snapshot.statistics("filename"))
+
+
+def spread(values):
+    # median absolute deviation: how far a typical sample is from the median
+    mid = statistics.median(values)
+    return statistics.median(abs(v - mid) for v in values)
+
+
+def run_all(pattern=None, rounds=7):
+    # every round samples every case once, so a slow moment on the machine hits
+    # all cases a little instead of one case a lot
+    todo = []
+    for name, (sizes, make) in CASES.items():
+        if pattern and pattern not in name:
+            continue
+        for size in sizes:
+            func = make(size)
+            key = f"{name}[{size}]"
+            if func is None:
+                print(f"{key:28} skipped (missing dependency)")
+                continue
+            todo.append((key, func, loops_for(func)))  # loops_for also warms up
+
+    samples = {key: [] for key, _, _ in todo}
+    for _ in range(rounds):
+        for key, func, loops in todo:
+            samples[key].append(sample(func, loops))
+
+    results = {}
+    for key, func, _ in todo:
+        seconds = [s for s, _ in samples[key]]
+        relative = [r for _, r in samples[key]]
+        # memory numbers: the smaller of two runs (the first may still fill caches)
+        (peak1, blocks1), (peak2, blocks2) = memory(func), memory(func)
+        r = results[key] = {
+            "seconds": statistics.median(seconds), "best": min(seconds),
+            "relative": statistics.median(relative), "relative_spread": spread(relative),
+            "peak_kb": round(min(peak1, peak2) / 1024, 1), "retained_blocks": min(blocks1, blocks2),
+        }
+        noise = 100 * r["relative_spread"] / r["relative"] if r["relative"] else 0.0
+        print(f"{key:28} {r['seconds'] * 1000:10.3f} ms +-{noise:4.1f}% {r['peak_kb']:10.1f} KB peak "
+              f"{r['retained_blocks']:8} blocks kept")
+    return results
+
+
+def compare(results, baseline, threshold):
+    # -> list of regression messages
+    problems = []
+    for key, r in results.items():
+        old = baseline.get(key)
+        if old is None:
+            continue
+        # median relative time must be worse by more than the threshold, by more than
+        # NOISE_SPREADS times the run-to-run spread of either run, and by MIN_SECONDS
+        noise = NOISE_SPREADS * max(r["relative_spread"], old["relative_spread"])
+        slower = (r["relative"] > old["relative"] * (1 + threshold)
+                  and r["relative"] - old["relative"] > noise
+                  and r["seconds"] - old["seconds"] > MIN_SECONDS)
+        if slower:
+            problems.append(f"{key}: {old['seconds'] * 1000:.3f} ms -> {r['seconds'] * 1000:.3f} ms "
+                            f"({old['relative']:.4f} -> {r['relative']:.4f} x reference)")
+        if r["peak_kb"] - old["peak_kb"] > MIN_KB and r["peak_kb"] > old["peak_kb"] * (1 + threshold):
+            problems.append(f"{key}: peak {old['peak_kb']} KB -> {r['peak_kb']} KB")
+        kept = old.get("retained_blocks")  # missing in baselines saved by older versions
+        if (kept is not None and r["retained_blocks"] - kept > MIN_BLOCKS
+                and r["retained_blocks"] > kept * (1 + threshold)):
+            problems.append(f"{key}: retained blocks {kept} -> {r['retained_blocks']}")
+    return problems
+
+
+def _load(path, default):
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return default
+
+
+def _save(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the example scripts")
+    parser.add_argument("-k", dest="pattern", help="only cases whose name contains this")
+    parser.add_argument("--rounds", type=int, default=7,
+                        help="timing samples per case (the median is compared)")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown / memory growth against the baseline (0.25 = 25%%)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store this run as the baseline to compare against")
+    parser.add_argument("--list", action="store_true", help="only list the cases")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, (sizes, _) in CASES.items():
+            print(f"{name:20} sizes {sizes}")
+        return 0
+
+    random.seed(0)
+    results = run_all(args.pattern, args.rounds)
+
+    history = _load(HISTORY, [])
+    history.append({"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+                    "machine": platform.machine(), "results": results})
+    _save(HISTORY, history)
+
+    if args.save_baseline:
+        baseline = _load(BASELINE, {})
+        baseline.update(results)
+        _save(BASELINE, baseline)
+        print(f"baseline saved ({len(results)} cases)")
+        return 0
+
+    baseline = _load(BASELINE, None)
+    if baseline is None:
+        print("no baseline yet, run with --save-baseline first")
+        return 0
+    problems = compare(results, baseline, args.threshold)
+    for p in problems:
+        print("REGRESSION", p)
+    if not problems:
+        print(f"no regressions (threshold {args.threshold:.0%})")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+# Dictionary encoding for the IPL player / team / venue columns
+# In kagle_ipl.ipynb the names in batter, bowler, fielder, team1, winner, venue ...
+# are Python strings repeated over ~260k deliveries, so every
+#     df[df['over'] >= 16].groupby('batter')
+# hashes the same strings again. Here every name gets a small integer code from
+# one shared dictionary per kind (player, team, venue, city). The same player has
+# the same code in deliveries.csv and matches.csv (batter, bowler, player_of_match ...),
+# so joins and groupbys run on int32 columns. Columns with missing names (fielder,
+# player_dismissed are mostly empty) become nullable Int32 with <NA>, so groupby
+# drops them exactly like it drops NaN strings. The dictionaries are saved to JSON and
+# only ever grow, so codes stay the same between runs.
+#
+#   enc = Encoder.load()
+#   deliveries = enc.encode(deliveries)
+#   top = deliveries[deliveries["over"] >= 16].groupby("batter")["batsman_runs"].sum()
+#   top.index = enc["player"].decode(top.index)
+#   enc.save()
+
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "ipl-complete-dataset-20082020")
+DICTIONARY = os.path.join(DATA_DIR, "dictionary.json")
+
+# kind -> columns (in either table) that hold values of that kind
+DOMAINS = {
+    "player": ["batter", "bowler", "non_striker", "fielder", "player_dismissed", "player_of_match"],
+    "team": ["batting_team", "bowling_team", "team1", "team2", "toss_winner", "winner"],
+    "venue": ["venue"],
+    "city": ["city"],
+}
+COLUMN_DOMAIN = {col: kind for kind, cols in DOMAINS.items() for col in cols}
+
+
+class Dictionary:
+    def __init__(self, values=()):
+        self.values = list(values)
+        self._index = pd.Index(self.values, dtype=object)
+
+    def __len__(self):
+        return len(self.values)
+
+    def encode(self, series, grow=True):
+        # -> int32 codes; Int32 with <NA> where a value is missing (or unknown when grow=False)
+        series = pd.Series(series)
+        codes = self._index.get_indexer(series)
+        if grow:
+            new = series[(codes == -1) & series.notna().to_numpy()].unique()
+            if len(new):
+                self.values.extend(new.tolist())
+                self._index = pd.Index(self.values, dtype=object)
+                codes = self._index.get_indexer(series)
+        missing = codes == -1
+        if missing.any():
+            return pd.arrays.IntegerArray(codes.astype(np.int32), missing)
+        return codes.astype(np.int32)
+
+    def decode(self, codes):
+        codes = pd.array(codes, dtype="Int32").to_numpy(dtype=np.intp, na_value=-1)
+        lookup = np.array(self.values + [None], dtype=object)  # -1 / <NA> -> None
+        return lookup[codes]
+
+    def code(self, value):
+        return int(self._index.get_loc(value))
+
+
+class Encoder:
+    def __init__(self, dictionaries=None, path=DICTIONARY):
+        self.path = path
+        self.dictionaries = {kind: Dictionary((dictionaries or {}).get(kind, ())) for kind in DOMAINS}
+
+    def __getitem__(self, kind):
+        return self.dictionaries[kind]
+
+    @classmethod
+    def load(cls, path=DICTIONARY):
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                return cls(json.load(f), path)
+        return cls(path=path)
+
+    def save(self, path=None):
+        path = path or self.path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({kind: d.values for kind, d in self.dictionaries.items()}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def encode(self, df, grow=True):
+        # returns a copy where every known name column is replaced by its int32 codes
+        df = df.copy()
+        for col in df.columns:
+            kind = COLUMN_DOMAIN.get(col)
+            if kind is not None:
+                df[col] = self.dictionaries[kind].encode(df[col], grow)
+        return df
+
+    def decode(self, df, columns=None):
+        df = df.copy()
+        for col in columns or [c for c in df.columns if c in COLUMN_DOMAIN]:
+            df[col] = self.dictionaries[COLUMN_DOMAIN[col]].decode(df[col].array)
+        return df
+
+
+def _sample(n_deliveries=260_000, seed=0):
+    # stand-in with the notebook's column names, for when the Kaggle files aren't downloaded
+    rng = np.random.default_rng(seed)
+    players = np.array([f"Player {i}" for i in range(700)], dtype=object)
+    teams = np.array([f"Team {i}" for i in range(15)], dtype=object)
+    venues = np.array([f"Stadium {i}" for i in range(50)], dtype=object)
+    n_matches = n_deliveries // 240
+    matches = pd.DataFrame({
+        "id": np.arange(n_matches),
+        "city": rng.choice(np.array([f"City {i}" for i in range(35)], dtype=object), n_matches),
+        "venue": rng.choice(venues, n_matches),
+        "team1": rng.choice(teams, n_matches),
+        "team2": rng.choice(teams, n_matches),
+        "winner": rng.choice(teams, n_matches),
+        "player_of_match": rng.choice(players, n_matches),
+    })
+    deliveries = pd.DataFrame({
+        "match_id": rng.integers(0, n_matches, n_deliveries),
+        "over": rng.integers(0, 20, n_deliveries),
+        "batting_team": rng.choice(teams, n_deliveries),
+        "batter": rng.choice(players, n_deliveries),
+        "bowler": rng.choice(players, n_deliveries),
+        "batsman_runs": rng.integers(0, 7, n_deliveries),
+    })
+    # like the real file: only catches and run outs have a fielder / dismissed player
+    for col, share in (("fielder", 0.03), ("player_dismissed", 0.05)):
+        deliveries[col] = np.where(rng.random(n_deliveries) < share,
+                                   rng.choice(players, n_deliveries), None)
+    return deliveries, matches
+
+
+if __name__ == "__main__":
+    if os.path.exists(os.path.join(DATA_DIR, "deliveries.csv")):
+        deliveries = pd.read_csv(os.path.join(DATA_DIR, "deliveries.csv"))
+        matches = pd.read_csv(os.path.join(DATA_DIR, "matches.csv"))
+        enc = Encoder.load()
+    else:
+        print("IPL files not found, using a generated sample")
+        deliveries, matches = _sample()
+        enc = Encoder(path=None)
+
+    start = time.perf_counter()
+    d_codes = enc.encode(deliveries)
+    m_codes = enc.encode(matches)
+    print(f"encoded in {time.perf_counter() - start:.3f}s: "
+          + ", ".join(f"{kind}: {len(d)}" for kind, d in enc.dictionaries.items()))
+    print(f"memory: {deliveries.memory_usage(deep=True).sum() / 1e6:.1f} MB -> "
+          f"{d_codes.memory_usage(deep=True).sum() / 1e6:.1f} MB")
+
+    def timed(label, func, repeat=5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            result = func()
+        print(f"  {label:8} {(time.perf_counter() - start) / repeat * 1000:7.1f} ms")
+        return result
+
+    print("death-over runs per batter:")
+    s = timed("strings", lambda: deliveries[deliveries["over"] >= 16].groupby("batter")["batsman_runs"].sum())
+    c = timed("codes", lambda: d_codes[d_codes["over"] >= 16].groupby("batter")["batsman_runs"].sum())
+    c.index = enc["player"].decode(c.index)
+    assert s.sort_index().equals(c.sort_index().rename_axis("batter"))
+    # missing fielders are dropped by both groupbys, not turned into a code of their own
+    s = deliveries.groupby("fielder").size()
+    c = d_codes.groupby("fielder").size()
+    c.index = enc["player"].decode(c.index)
+    assert s.sort_index().equals(c.sort_index().rename_axis("fielder"))
+
+    print("deliveries joined with matches on (match, batting team == winner):")
+    timed("strings", lambda: deliveries.merge(matches, left_on=["match_id", "batting_team"],
+                                              right_on=["id", "winner"]))
+    timed("codes", lambda: d_codes.merge(m_codes, left_on=["match_id", "batting_team"],
+                                         right_on=["id", "winner"]))
+    if enc.path:
+        enc.save()
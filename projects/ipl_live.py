@@ -0,0 +1,322 @@
+# Live match state for IPL ball-by-ball data
+# kagle_ipl.ipynb works out is_legal, legal_ball, adjusted_over_ball and
+# all_balls_over_ball for the whole of deliveries.csv and aggregates afterwards.
+# LiveEngine gets the same numbers while a match is going on: it takes one
+# delivery at a time (a row with the deliveries.csv columns) and updates a
+# handful of counters, so each event costs O(1) however long the match is.
+#
+#   engine = LiveEngine(targets={match_id: (target_runs, target_overs)})   # targets optional
+#   for delivery in feed:
+#       engine.feed(delivery)
+#       state = engine.snapshot(delivery.match_id)
+#       print(state["score"], state["wickets"], state["crr"], state["rrr"])
+#
+# Deliveries of several matches can arrive mixed together; each match keeps its own state.
+#
+#   python ipl_live.py                     replay every season at full speed
+#   python ipl_live.py --season 2019 --check
+#   python ipl_live.py --match 335982 --show
+
+import argparse
+import os
+import random
+import time
+
+import pandas as pd
+
+from ipl_encoding import DATA_DIR
+
+COLUMNS = ["match_id", "inning", "batting_team", "bowling_team", "over", "ball", "batter",
+           "bowler", "non_striker", "batsman_runs", "extra_runs", "total_runs", "extras_type",
+           "is_wicket", "player_dismissed", "dismissal_kind", "fielder"]
+
+ILLEGAL = {"wides", "noballs"}              # not one of the 6 balls of an over
+NOT_BOWLER_RUNS = {"byes", "legbyes", "penalty"}
+NOT_BOWLER_WICKETS = {"run out", "retired hurt", "retired out", "obstructing the field"}
+OVERS = 20
+
+
+class Innings:
+    __slots__ = ("number", "batting_team", "bowling_team", "target", "max_balls", "runs",
+                 "wickets", "legal_balls", "over", "ball", "legal_in_over", "partnership_runs",
+                 "partnership_balls", "batters", "bowlers", "last_bowler")
+
+    def __init__(self, number, batting_team, bowling_team, target=None, overs=OVERS):
+        self.number = number
+        self.batting_team = batting_team
+        self.bowling_team = bowling_team
+        self.target = target
+        self.max_balls = int(round(overs * 6))
+        self.runs = self.wickets = self.legal_balls = 0
+        self.over = self.ball = self.legal_in_over = 0
+        self.partnership_runs = self.partnership_balls = 0
+        self.batters = {}   # name -> (runs, balls faced)
+        self.bowlers = {}   # name -> (legal balls, runs conceded, wickets)
+        self.last_bowler = None
+
+
+class MatchState:
+    __slots__ = ("match_id", "innings", "first_innings_runs", "target", "target_overs", "events")
+
+    def __init__(self, match_id, target=None, target_overs=None):
+        self.match_id = match_id
+        self.innings = None
+        self.first_innings_runs = None
+        self.target = target              # from matches.csv (already D/L adjusted) if known
+        self.target_overs = target_overs
+        self.events = 0
+
+
+def _overs(balls):
+    return f"{balls // 6}.{balls % 6}"
+
+
+class LiveEngine:
+    def __init__(self, targets=None):
+        self.targets = targets or {}  # match_id -> (target_runs, target_overs)
+        self.matches = {}
+        self.events = 0
+
+    def _innings(self, d):
+        match = self.matches.get(d.match_id)
+        if match is None:
+            match = self.matches[d.match_id] = MatchState(d.match_id, *self.targets.get(d.match_id, (None, None)))
+        inn = match.innings
+        if inn is None or inn.number != d.inning:
+            if inn is not None and inn.number == 1:
+                match.first_innings_runs = inn.runs
+            target, overs = None, OVERS
+            if d.inning == 2:
+                target = match.target if match.target is not None else (match.first_innings_runs or 0) + 1
+                overs = match.target_overs or OVERS
+            elif d.inning > 2:
+                overs = 1  # super over
+            inn = match.innings = Innings(d.inning, d.batting_team, d.bowling_team, target, overs)
+        match.events += 1
+        return inn
+
+    def feed(self, d):
+        # d: anything with the deliveries.csv columns as attributes (a namedtuple row)
+        inn = self._innings(d)
+        self.events += 1
+        extras = d.extras_type
+        legal = extras not in ILLEGAL
+        total = d.total_runs
+
+        if d.over != inn.over:
+            inn.over, inn.legal_in_over = d.over, 0
+        inn.ball = d.ball
+        inn.runs += total
+        inn.partnership_runs += total
+        if legal:
+            inn.legal_balls += 1
+            inn.legal_in_over += 1
+            inn.partnership_balls += 1
+
+        runs, faced = inn.batters.get(d.batter, (0, 0))
+        inn.batters[d.batter] = (runs + d.batsman_runs, faced + (extras != "wides"))
+
+        balls, conceded, wickets = inn.bowlers.get(d.bowler, (0, 0, 0))
+        if extras in NOT_BOWLER_RUNS:
+            conceded += d.batsman_runs
+        else:
+            conceded += total
+        if d.is_wicket:
+            inn.wickets += 1
+            inn.partnership_runs = inn.partnership_balls = 0
+            if d.dismissal_kind not in NOT_BOWLER_WICKETS:
+                wickets += 1
+        inn.bowlers[d.bowler] = (balls + legal, conceded, wickets)
+        inn.last_bowler = d.bowler
+        return inn
+
+    def snapshot(self, match_id):
+        # plain values only (the per-player dicts hold tuples, so a shallow copy is enough)
+        match = self.matches[match_id]
+        inn = match.innings
+        balls_left = max(inn.max_balls - inn.legal_balls, 0)
+        needed = inn.target - inn.runs if inn.target is not None else None
+        return {
+            "match_id": match_id,
+            "inning": inn.number,
+            "batting_team": inn.batting_team,
+            "bowling_team": inn.bowling_team,
+            "score": inn.runs,
+            "wickets": inn.wickets,
+            "overs": _overs(inn.legal_balls),
+            # the notebook's columns for the last delivery
+            "legal_ball": inn.legal_in_over,
+            "adjusted_over_ball": inn.over + inn.legal_in_over / 10,
+            "all_balls_over_ball": inn.over + inn.ball / 10,
+            "crr": round(inn.runs * 6 / inn.legal_balls, 2) if inn.legal_balls else 0.0,
+            "target": inn.target,
+            "needed": needed,
+            "balls_left": balls_left,
+            "rrr": (round(needed * 6 / balls_left, 2) if balls_left else None) if needed is not None else None,
+            "partnership": (inn.partnership_runs, inn.partnership_balls),
+            "bowler": inn.last_bowler,
+            "bowlers": dict(inn.bowlers),
+            "batters": dict(inn.batters),
+        }
+
+
+# ---------- data ----------
+
+def load(season=None, match=None):
+    # -> (deliveries, matches); a generated stand-in when the Kaggle files aren't there
+    path = os.path.join(DATA_DIR, "deliveries.csv")
+    if os.path.exists(path):
+        deliveries = pd.read_csv(path)
+        matches = pd.read_csv(os.path.join(DATA_DIR, "matches.csv"))
+    else:
+        print("IPL files not found, using a generated sample")
+        deliveries, matches = _sample()
+    if season is not None:
+        matches = matches[matches["season"].astype(str).str.startswith(str(season))]
+        deliveries = deliveries[deliveries["match_id"].isin(matches["id"])]
+    if match is not None:
+        deliveries = deliveries[deliveries["match_id"] == match]
+    return deliveries, matches
+
+
+def targets_from(matches):
+    # matches.csv has target_runs / target_overs for the chase (rain-adjusted games included)
+    if "target_runs" not in matches:
+        return {}
+    known = matches.dropna(subset=["target_runs"])
+    overs = known["target_overs"] if "target_overs" in known else pd.Series(None, index=known.index)
+    return {m: (int(r), None if pd.isna(o) else o)
+            for m, r, o in zip(known["id"], known["target_runs"], overs)}
+
+
+def _sample(seasons=(2019, 2020), matches_per_season=60, seed=0):
+    rng = random.Random(seed)
+    teams = [f"Team {i}" for i in range(8)]
+    rows, match_rows = [], []
+    outcomes = [0, 1, 2, 3, 4, 6]
+    weights = [35, 35, 8, 1, 14, 7]
+    kinds = ["caught", "bowled", "lbw", "run out", "stumped"]
+    match_id = 100_000
+    for season in seasons:
+        for _ in range(matches_per_season):
+            match_id += 1
+            t1, t2 = rng.sample(teams, 2)
+            first = 0
+            for inning, (bat, bowl) in enumerate(((t1, t2), (t2, t1)), start=1):
+                batters = [f"{bat} batter {i}" for i in range(11)]
+                bowlers = [f"{bowl} bowler {i}" for i in range(5)]
+                striker, other, next_in = batters[0], batters[1], 2
+                runs = wickets = 0
+                for over in range(OVERS):
+                    bowler = bowlers[over % 5]
+                    legal = ball = 0
+                    while legal < 6:
+                        ball += 1
+                        r = rng.random()
+                        extras_type, extra, bat_runs = None, 0, 0
+                        if r < 0.03:
+                            extras_type, extra = "wides", 1
+                        elif r < 0.035:
+                            extras_type, extra = "noballs", 1
+                            bat_runs = rng.choices(outcomes, weights)[0]
+                        elif r < 0.055:
+                            extras_type, extra = "legbyes", rng.choice([1, 1, 2, 4])
+                        else:
+                            bat_runs = rng.choices(outcomes, weights)[0]
+                        wicket = extras_type is None and rng.random() < 0.045
+                        kind = rng.choice(kinds) if wicket else None
+                        rows.append((match_id, inning, bat, bowl, over, ball, striker, bowler, other,
+                                     bat_runs, extra, bat_runs + extra, extras_type, int(wicket),
+                                     striker if wicket else None, kind, None))
+                        runs += bat_runs + extra
+                        legal += extras_type not in ILLEGAL
+                        if (bat_runs + extra) % 2:
+                            striker, other = other, striker
+                        if wicket:
+                            wickets += 1
+                            if wickets == 10:
+                                break
+                            striker, next_in = batters[next_in], next_in + 1
+                        if inning == 2 and runs > first:
+                            break
+                    if wickets == 10 or (inning == 2 and runs > first):
+                        break
+                    striker, other = other, striker
+                first = runs if inning == 1 else first
+            match_rows.append((match_id, season, t1, t2, first + 1, 20.0))
+    deliveries = pd.DataFrame(rows, columns=COLUMNS)
+    matches = pd.DataFrame(match_rows, columns=["id", "season", "team1", "team2", "target_runs", "target_overs"])
+    return deliveries, matches
+
+
+# ---------- replay ----------
+
+def replay(deliveries, targets=None, every=None):
+    # streams the rows through a fresh engine; every=n yields a snapshot every n events
+    engine = LiveEngine(targets)
+    rows = deliveries[COLUMNS].itertuples(index=False, name="Delivery")
+    start = time.perf_counter()
+    for n, d in enumerate(rows, start=1):
+        engine.feed(d)
+        if every and n % every == 0:
+            engine.snapshot(d.match_id)
+    return engine, time.perf_counter() - start
+
+
+def check(engine, deliveries):
+    # final per-innings totals and bowler figures vs a groupby over the whole table
+    totals = deliveries.groupby(["match_id", "inning"]).agg(runs=("total_runs", "sum"),
+                                                            wickets=("is_wicket", "sum"))
+    for (m, inning), row in totals.iterrows():
+        state = engine.matches[m]
+        if inning == 1 and state.innings.number > 1:
+            assert state.first_innings_runs == row["runs"], (m, inning)
+        elif inning == state.innings.number:
+            assert (state.innings.runs, state.innings.wickets) == (row["runs"], row["wickets"]), (m, inning)
+    legal = ~deliveries["extras_type"].isin(ILLEGAL)
+    balls = deliveries[legal].groupby(["match_id", "inning", "bowler"]).size()
+    for m, state in engine.matches.items():
+        inn = state.innings
+        for bowler, (b, _, _) in inn.bowlers.items():
+            assert balls.get((m, inn.number, bowler), 0) == b, (m, bowler)
+    return len(engine.matches)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay IPL deliveries through the live engine")
+    parser.add_argument("--season", help="only this season (e.g. 2019 or 2007/08)")
+    parser.add_argument("--match", type=int, help="only this match id")
+    parser.add_argument("--snapshot-every", type=int, default=0,
+                        help="also take a snapshot every N events")
+    parser.add_argument("--show", action="store_true", help="print the state after every over")
+    parser.add_argument("--check", action="store_true", help="compare the final state with pandas")
+    args = parser.parse_args(argv)
+
+    deliveries, matches = load(args.season, args.match)
+    targets = targets_from(matches)
+    if deliveries.empty:
+        print("no deliveries for that selection")
+        return 1
+
+    if args.show:
+        engine = LiveEngine(targets)
+        for d in deliveries[COLUMNS].itertuples(index=False, name="Delivery"):
+            engine.feed(d)
+            s = engine.snapshot(d.match_id)
+            if s["legal_ball"] == 6:
+                rrr = f" need {s['needed']} off {s['balls_left']} (rrr {s['rrr']})" if s["target"] else ""
+                print(f"{s['match_id']} inn {s['inning']} {s['batting_team']:>12} {s['score']}/{s['wickets']} "
+                      f"in {s['overs']} crr {s['crr']}{rrr} p'ship {s['partnership'][0]}"
+                      f"({s['partnership'][1]}) {s['bowler']} {s['bowlers'][s['bowler']]}")
+        return 0
+
+    engine, seconds = replay(deliveries, targets, args.snapshot_every)
+    print(f"{engine.events} deliveries from {len(engine.matches)} matches in {seconds:.3f}s "
+          f"({engine.events / seconds:,.0f} events/s)")
+    if args.check:
+        print(f"final state matches pandas for {check(engine, deliveries)} matches")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
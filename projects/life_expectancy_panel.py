@@ -0,0 +1,160 @@
+# Life Expectancy panel data (country x year)
+# "Life Expectancy Data.csv" has one row per (Country, Year) and 19 numeric indicators.
+# Most questions ("how did BMI change in India?", "which countries improved fastest?")
+# end up as df.sort_values(...).groupby('Country')... again and again.
+#
+# Panel loads the file once:
+#   - column names are cleaned ('Life expectancy ' -> 'life_expectancy', ' BMI ' -> 'bmi')
+#   - every indicator becomes a dense NumPy matrix, rows = countries, columns = years
+#     (missing values are NaN)
+# so trends, rolling windows, year-over-year changes and correlations are plain
+# matrix operations over all countries at once.
+#
+#   panel = Panel.load()
+#   panel.series("life_expectancy", "India")
+#   panel.trend("life_expectancy").sort_values().tail()
+
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "-1) datasets", "Life Expectancy Data.csv")
+
+
+def clean_name(name):
+    # ' thinness  1-19 years' -> 'thinness_1_19_years', ' HIV/AIDS' -> 'hiv_aids'
+    return re.sub(r"[^0-9a-z]+", "_", name.strip().lower()).strip("_")
+
+
+class Panel:
+    def __init__(self, countries, years, status, matrices):
+        self.countries = countries  # pd.Index
+        self.years = years          # pd.Index
+        self.status = status        # Series: country -> Developed / Developing
+        self.matrices = matrices    # indicator -> float array (countries x years)
+
+    @classmethod
+    def from_frame(cls, df):
+        df = df.rename(columns=clean_name)
+        countries = pd.Index(sorted(df["country"].unique()), name="country")
+        years = pd.Index(np.arange(df["year"].min(), df["year"].max() + 1), name="year")
+        rows = countries.get_indexer(df["country"])
+        cols = years.get_indexer(df["year"])
+
+        matrices = {}
+        for col in df.columns:
+            if col in ("country", "year") or not pd.api.types.is_numeric_dtype(df[col]):
+                continue
+            m = np.full((len(countries), len(years)), np.nan)
+            m[rows, cols] = df[col].to_numpy(dtype=float)
+            matrices[col] = m
+
+        status = df.drop_duplicates("country").set_index("country")["status"].reindex(countries)
+        return cls(countries, years, status, matrices)
+
+    @classmethod
+    def load(cls, path=DATA):
+        return cls.from_frame(pd.read_csv(path))
+
+    @property
+    def indicators(self):
+        return list(self.matrices)
+
+    def matrix(self, indicator):
+        return self.matrices[clean_name(indicator)]
+
+    def frame(self, indicator):
+        # countries x years as a DataFrame (a view-like copy, handy for printing)
+        return pd.DataFrame(self.matrix(indicator), index=self.countries, columns=self.years)
+
+    def series(self, indicator, country):
+        return pd.Series(self.matrix(indicator)[self.countries.get_loc(country)], index=self.years,
+                         name=clean_name(indicator))
+
+    def year(self, indicator, year):
+        return pd.Series(self.matrix(indicator)[:, self.years.get_loc(year)], index=self.countries,
+                         name=year)
+
+    def yoy(self, indicator):
+        # year-over-year change; first year is NaN
+        m = self.matrix(indicator)
+        out = np.full_like(m, np.nan)
+        out[:, 1:] = m[:, 1:] - m[:, :-1]
+        return out
+
+    def rolling_mean(self, indicator, window, min_periods=1):
+        # NaN-aware moving average along the years, via cumulative sums
+        m = self.matrix(indicator)
+        valid = ~np.isnan(m)
+        csum = np.cumsum(np.where(valid, m, 0.0), axis=1)
+        ccount = np.cumsum(valid, axis=1)
+        csum = np.pad(csum, ((0, 0), (1, 0)))
+        ccount = np.pad(ccount, ((0, 0), (1, 0)))
+        lo = np.maximum(np.arange(m.shape[1]) + 1 - window, 0)
+        hi = np.arange(m.shape[1]) + 1
+        total = csum[:, hi] - csum[:, lo]
+        count = ccount[:, hi] - ccount[:, lo]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(count >= min_periods, total / count, np.nan)
+
+    def trend(self, indicator):
+        # least-squares slope per year for every country (NaNs skipped)
+        m = self.matrix(indicator)
+        valid = ~np.isnan(m)
+        x = np.broadcast_to(self.years.to_numpy(dtype=float), m.shape)
+        n = valid.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            x_mean = np.where(valid, x, 0).sum(axis=1) / n
+            y_mean = np.where(valid, m, 0).sum(axis=1) / n
+            dx = np.where(valid, x - x_mean[:, None], 0)
+            dy = np.where(valid, m - y_mean[:, None], 0)
+            slope = (dx * dy).sum(axis=1) / (dx * dx).sum(axis=1)
+        slope[n < 2] = np.nan
+        return pd.Series(slope, index=self.countries, name=f"{clean_name(indicator)}_per_year")
+
+    def correlate(self, indicator_a, indicator_b):
+        # per-country correlation of two indicators over the years
+        a, b = self.matrix(indicator_a), self.matrix(indicator_b)
+        valid = ~np.isnan(a) & ~np.isnan(b)
+        n = valid.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            a_mean = np.where(valid, a, 0).sum(axis=1) / n
+            b_mean = np.where(valid, b, 0).sum(axis=1) / n
+            da = np.where(valid, a - a_mean[:, None], 0)
+            db = np.where(valid, b - b_mean[:, None], 0)
+            r = (da * db).sum(axis=1) / np.sqrt((da * da).sum(axis=1) * (db * db).sum(axis=1))
+        r[n < 3] = np.nan
+        return pd.Series(r, index=self.countries, name="r")
+
+    def country_correlation(self, indicator, min_periods=5):
+        # country x country correlation of one indicator's time series
+        return self.frame(indicator).T.corr(min_periods=min_periods)
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    panel = Panel.load()
+    print(f"loaded {len(panel.countries)} countries x {len(panel.years)} years, "
+          f"{len(panel.indicators)} indicators in {time.perf_counter() - start:.3f}s")
+    print(panel.indicators)
+
+    print("\nLife expectancy in India:\n", panel.series("Life expectancy ", "India").tail())
+    print("\nFastest improving countries:\n", panel.trend("life_expectancy").nlargest(5))
+    print("\nSchooling vs life expectancy (median per-country r):",
+          round(panel.correlate("schooling", "life_expectancy").median(), 3))
+
+    # same slope with the usual groupby, for comparison
+    df = pd.read_csv(DATA).rename(columns=clean_name)
+    start = time.perf_counter()
+    slow = df.sort_values("year").groupby("country").apply(
+        lambda g: np.polyfit(g["year"], g["life_expectancy"], 1)[0] if g["life_expectancy"].notna().sum() > 1 else np.nan,
+        include_groups=False)
+    t_groupby = time.perf_counter() - start
+    start = time.perf_counter()
+    fast = panel.trend("life_expectancy")
+    t_panel = time.perf_counter() - start
+    assert np.allclose(slow.reindex(fast.index).dropna(), fast.dropna())
+    print(f"\ntrend: groupby+polyfit {t_groupby:.4f}s  panel {t_panel:.4f}s")
@@ -0,0 +1,143 @@
+# Training / evaluation harness for winequality-red.csv
+# The data (11 features + quality) is loaded once into a shared-memory float32
+# array. Worker processes attach to that block instead of getting their own
+# pickled copy, then run every (model config, CV fold) job in parallel and record
+# how long fit and predict took.
+#
+#   python wine_quality_train.py --workers 4 --folds 5 --out results.json
+
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "-1) datasets", "winequality-red.csv")
+
+# model name -> (import path, parameter grid, standardize features first?)
+GRID = {
+    "random_forest": ("sklearn.ensemble.RandomForestClassifier",
+                      {"n_estimators": [100, 300], "max_depth": [None, 10], "random_state": [0]}, False),
+    "extra_trees": ("sklearn.ensemble.ExtraTreesClassifier",
+                    {"n_estimators": [100, 300], "max_depth": [None, 10], "random_state": [0]}, False),
+    "logistic_regression": ("sklearn.linear_model.LogisticRegression",
+                            {"C": [0.1, 1.0, 10.0], "max_iter": [1000]}, True),
+}
+
+# set in each worker by _attach()
+_shm = None
+_data = None
+
+
+def load_shared(path=DATA):
+    # -> (SharedMemory block, array shape); last column is the label
+    values = pd.read_csv(path).to_numpy(dtype=np.float32)
+    shm = shared_memory.SharedMemory(create=True, size=values.nbytes)
+    shared = np.ndarray(values.shape, dtype=np.float32, buffer=shm.buf)
+    shared[:] = values
+    return shm, values.shape
+
+
+def _attach(name, shape):
+    global _shm, _data
+    _shm = shared_memory.SharedMemory(name=name)
+    _data = np.ndarray(shape, dtype=np.float32, buffer=_shm.buf)
+
+
+def _build(model_path, params, scale):
+    module, cls = model_path.rsplit(".", 1)
+    model = getattr(__import__(module, fromlist=[cls]), cls)(**params)
+    if scale:
+        from sklearn.pipeline import make_pipeline
+        from sklearn.preprocessing import StandardScaler
+        model = make_pipeline(StandardScaler(), model)
+    return model
+
+
+def run_job(model_name, model_path, params, scale, fold, train_idx, test_idx):
+    X, y = _data[:, :-1], _data[:, -1].astype(np.int64)
+    model = _build(model_path, params, scale)
+
+    start = time.perf_counter()
+    model.fit(X[train_idx], y[train_idx])
+    fit_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pred = model.predict(X[test_idx])
+    predict_time = time.perf_counter() - start
+
+    return {
+        "model": model_name,
+        "params": params,
+        "fold": fold,
+        "accuracy": float((pred == y[test_idx]).mean()),
+        "fit_seconds": fit_time,
+        "predict_seconds": predict_time,
+    }
+
+
+def jobs(labels, folds, grid=GRID, seed=0):
+    from sklearn.model_selection import KFold, StratifiedKFold
+
+    # quality 3 and 8 are rare; fall back to plain KFold if a class is smaller than `folds`
+    counts = np.bincount(labels)
+    if counts[counts > 0].min() >= folds:
+        splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed)
+    else:
+        splitter = KFold(n_splits=folds, shuffle=True, random_state=seed)
+    splits = list(splitter.split(np.zeros(len(labels)), labels))
+
+    for name, (path, param_grid, scale) in grid.items():
+        keys = list(param_grid)
+        for combo in itertools.product(*(param_grid[k] for k in keys)):
+            params = dict(zip(keys, combo))
+            for fold, (train_idx, test_idx) in enumerate(splits):
+                yield name, path, params, scale, fold, train_idx, test_idx
+
+
+def summarize(results):
+    df = pd.DataFrame(results)
+    df["config"] = df["model"] + " " + df["params"].astype(str)
+    return (df.groupby("config")
+              .agg(accuracy=("accuracy", "mean"), fit_ms=("fit_seconds", "mean"),
+                   predict_ms=("predict_seconds", "mean"))
+              .assign(fit_ms=lambda d: d.fit_ms * 1000, predict_ms=lambda d: d.predict_ms * 1000)
+              .sort_values("accuracy", ascending=False))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cross-validated grid search on wine quality")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--out", help="write every job's result to this JSON file")
+    args = parser.parse_args(argv)
+
+    shm, shape = load_shared()
+    try:
+        labels = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)[:, -1].astype(np.int64)
+        todo = list(jobs(labels, args.folds))
+        start = time.perf_counter()
+        with ProcessPoolExecutor(args.workers, initializer=_attach, initargs=(shm.name, shape)) as pool:
+            futures = [pool.submit(run_job, *job) for job in todo]
+            results = [f.result() for f in futures]
+        wall = time.perf_counter() - start
+    finally:
+        shm.close()
+        shm.unlink()
+
+    pd.set_option("display.width", 160)
+    print(summarize(results).round(3).to_string())
+    print(f"\n{len(results)} fits on {args.workers} workers in {wall:.2f}s")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())